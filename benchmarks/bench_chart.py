@@ -0,0 +1,88 @@
+"""
+Chart rendering benchmark.
+Measures raw render time of the PNG line chart renderer and the cost of
+cold versus cached /chart requests through ChartService.
+Run with: python -m benchmarks.bench_chart
+"""
+
+import asyncio
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.services.chart_service import ChartService
+from src.utils.chart_renderer import render_line_chart
+
+SNAPSHOT_DATE = "2025-07-01"
+
+
+class StubAPIService:
+    """In-memory stand-in for APIService so the benchmark never touches the network"""
+
+    def __init__(self):
+        self.history_calls = 0
+
+    async def get_current_rates(self) -> Optional[Dict]:
+        return {'date': SNAPSHOT_DATE, 'usd': {'eur': 0.85}}
+
+    async def get_history(self, end_date: str, days: int, points: int) -> List[Dict]:
+        self.history_calls += 1
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        step = max(1, days // (points - 1))
+        return [
+            {
+                'date': (end - timedelta(days=offset)).strftime('%Y-%m-%d'),
+                'usd': {'eur': 0.85 + 0.01 * math.sin(offset / 3)},
+            }
+            for offset in range(days, -1, -step)
+        ]
+
+
+def bench_render(iterations: int = 50) -> None:
+    """Time the renderer in-process"""
+    values = [0.85 + 0.01 * math.sin(i / 3) for i in range(31)]
+    render_line_chart(values)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        png = render_line_chart(values)
+    elapsed = time.perf_counter() - start
+
+    print(f"render_line_chart: {elapsed / iterations * 1000:.2f} ms/chart "
+          f"({len(png) / 1024:.1f} KiB PNG, {iterations} iterations)")
+
+
+async def bench_service(repeats: int = 1000) -> None:
+    """Time a cold chart request against repeated cached requests"""
+    api = StubAPIService()
+    service = ChartService(api)
+    try:
+        start = time.perf_counter()
+        entry = await service.get_chart('eur', 30)
+        cold = time.perf_counter() - start
+        service.remember_file_id(entry['key'], "benchmark-file-id")
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            await service.get_chart('eur', 30)
+        warm = (time.perf_counter() - start) / repeats
+
+        concurrent_service = ChartService(api)
+        start = time.perf_counter()
+        await asyncio.gather(*(concurrent_service.get_chart('eur', 60) for _ in range(50)))
+        burst = time.perf_counter() - start
+        concurrent_service.shutdown()
+    finally:
+        service.shutdown()
+
+    print(f"cold request (process pool start + render): {cold * 1000:.2f} ms")
+    print(f"cached request: {warm * 1_000_000:.1f} µs")
+    print(f"50 concurrent identical cold requests: {burst * 1000:.2f} ms "
+          f"(renders: {concurrent_service.stats['renders']})")
+    print(f"stats: {service.stats} (history fetches: {api.history_calls})")
+
+
+if __name__ == '__main__':
+    bench_render()
+    asyncio.run(bench_service())
@@ -0,0 +1,118 @@
+"""
+Cold start benchmark.
+Measures time-to-first-correct-reply after a restart: each scenario runs
+in a fresh interpreter that imports the bot, optionally runs the startup
+warmup, then answers /rates. A stale persisted snapshot should be served
+immediately while the refresh continues in the background. Upstream
+fetches are replaced by a fixture with a simulated CDN latency so results
+are repeatable offline.
+Run with: python -m benchmarks.bench_cold_start [cdn_latency_ms]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+CHILD = r'''
+import time
+process_start = time.perf_counter()
+
+import asyncio
+import json
+import sys
+from types import SimpleNamespace
+
+from src.bot.xchange_bot import XChangeBot
+from src.data.currency_data import CurrencyData
+from src.services import rate_providers
+from src.services.api_service import APIService
+
+data_dir, use_warmup, latency = sys.argv[1], sys.argv[2] == "1", float(sys.argv[3])
+FIXTURE = {'date': '2025-07-01', 'usd': {code: 1.0 + i for i, code in enumerate(CurrencyData.CURRENCIES)}}
+
+def fake_fetch(url, description, timeout=None):
+    time.sleep(latency)
+    return FIXTURE
+
+rate_providers.fetch_json = fake_fetch
+APIService.RATE_PROVIDERS = "fawaz"
+
+async def main():
+    imported = time.perf_counter()
+    bot = XChangeBot("123456:BENCHMARK", data_dir=data_dir)
+    if use_warmup:
+        await bot.warmup()
+    ready = time.perf_counter()
+
+    replies = []
+    async def reply_text(text, **kwargs):
+        replies.append((time.perf_counter(), text))
+
+    update = SimpleNamespace(message=SimpleNamespace(reply_text=reply_text))
+    await bot.get_rates(update, SimpleNamespace(args=[]))
+    replied, text = replies[0]
+    print(json.dumps({
+        'import_ms': (imported - process_start) * 1000,
+        'ready_ms': (ready - process_start) * 1000,
+        'first_reply_ms': (replied - process_start) * 1000,
+        'reply_after_ready_ms': (replied - ready) * 1000,
+        'correct': 'Live Exchange Rates' in text,
+    }))
+
+asyncio.run(main())
+'''
+
+
+def run_scenario(data_dir: str, use_warmup: bool, latency: float) -> dict:
+    """Run one cold start in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, data_dir, "1" if use_warmup else "0", str(latency)],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(latency_ms: float = 300.0) -> None:
+    """Compare cold start without warmup, with warmup and with fresh or stale persisted snapshots"""
+    latency = latency_ms / 1000
+    with tempfile.TemporaryDirectory() as root:
+        # Populate the warm store with a persisted snapshot, as a previous process would have
+        warm_dir = f"{root}/warm"
+        run_scenario(warm_dir, True, 0.0)
+
+        # A copy whose snapshot was fetched a day ago, well past RATES_CACHE_TTL
+        stale_dir = f"{root}/stale"
+        shutil.copytree(warm_dir, stale_dir)
+        snapshot_path = os.path.join(stale_dir, "snapshots.json")
+        with open(snapshot_path, encoding='utf-8') as f:
+            state = json.load(f)
+        state['fetched_at'] = time.time() - 86400
+        with open(snapshot_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+        scenarios = [
+            ("no warmup, empty store", f"{root}/cold-1", False),
+            ("warmup, empty store", f"{root}/cold-2", True),
+            ("warmup, persisted snapshot", warm_dir, True),
+            ("warmup, stale snapshot", stale_dir, True),
+        ]
+        print(f"simulated CDN latency: {latency_ms:.0f} ms")
+        print(f"{'scenario':<28} {'import':>8} {'ready':>8} {'1st reply':>10} {'after ready':>12}")
+        for name, data_dir, use_warmup in scenarios:
+            started = time.perf_counter()
+            result = run_scenario(data_dir, use_warmup, latency)
+            assert result['correct'], f"{name} produced an incorrect reply"
+            print(f"{name:<28} {result['import_ms']:>6.0f}ms {result['ready_ms']:>6.0f}ms "
+                  f"{result['first_reply_ms']:>8.0f}ms {result['reply_after_ready_ms']:>10.1f}ms"
+                  f"   (wall {(time.perf_counter() - started) * 1000:.0f}ms)")
+
+
+if __name__ == '__main__':
+    main(*(float(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,77 @@
+"""
+Conversion benchmark.
+Compares batch conversions on the previous binary float path against
+ConversionEngine's Decimal path, including display formatting, and shows
+where the float path drifts from the exact result.
+Run with: python -m benchmarks.bench_conversion [conversions]
+"""
+
+import random
+import sys
+import time
+from decimal import Decimal
+
+from src.data.currency_data import CurrencyData
+from src.services.conversion_engine import ConversionEngine
+from src.utils.formatter import MessageFormatter
+
+SNAPSHOT = {
+    'date': '2025-07-01',
+    'usd': {
+        'khr': 4012.345678, 'cny': 7.16543, 'jpy': 144.123456, 'krw': 1361.987654, 'thb': 32.456789,
+        'vnd': 26150.123456, 'mmk': 2099.876543, 'bnd': 1.273456, 'lak': 21567.891234, 'sgd': 1.27345,
+        'myr': 4.21987, 'idr': 16234.567891, 'aud': 1.52345, 'nzd': 1.65432, 'chf': 0.79876,
+        'eur': 0.85123, 'gbp': 0.73456, 'inr': 85.67891, 'usd': 1.0,
+    }
+}
+
+
+def float_path(requests, usd_rates, formatter):
+    """The previous float conversion and formatting"""
+    return [
+        formatter.format_amount(amount / usd_rates[from_currency] * usd_rates[to_currency])
+        for amount, from_currency, to_currency in requests
+    ]
+
+
+def decimal_path(requests, engine, formatter):
+    """ConversionEngine conversion and formatting"""
+    return [
+        formatter.format_decimal_amount(engine.convert(amount, from_currency, to_currency, SNAPSHOT))
+        for amount, from_currency, to_currency in requests
+    ]
+
+
+def main(conversions: int = 100_000) -> None:
+    """Time both paths over the same random batch"""
+    random.seed(7)
+    codes = CurrencyData.get_currencies()
+    amounts = [f"{random.uniform(1, 10 ** random.randint(1, 12)):.2f}" for _ in range(conversions)]
+    pairs = [tuple(random.sample(codes, 2)) for _ in range(conversions)]
+
+    float_requests = [(float(amount), a, b) for amount, (a, b) in zip(amounts, pairs)]
+    decimal_requests = [(Decimal(amount), a, b) for amount, (a, b) in zip(amounts, pairs)]
+    formatter = MessageFormatter()
+    engine = ConversionEngine()
+
+    start = time.perf_counter()
+    float_path(float_requests, SNAPSHOT['usd'], formatter)
+    float_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decimal_path(decimal_requests, engine, formatter)
+    decimal_time = time.perf_counter() - start
+
+    print(f"{conversions:,} conversions incl. formatting")
+    print(f"float path:   {float_time * 1000:8.1f} ms ({float_time / conversions * 1e6:.2f} µs each)")
+    print(f"decimal path: {decimal_time * 1000:8.1f} ms ({decimal_time / conversions * 1e6:.2f} µs each)")
+    print(f"decimal / float: {decimal_time / float_time:.2f}x")
+
+    amount = "987654321987.65"
+    exact = engine.convert(Decimal(amount), 'khr', 'vnd', SNAPSHOT)
+    drifted = float(amount) / SNAPSHOT['usd']['khr'] * SNAPSHOT['usd']['vnd']
+    print(f"\n{amount} KHR -> VND  float: {drifted:,.2f}  decimal: {formatter.format_decimal_amount(exact)}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
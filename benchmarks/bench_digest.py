@@ -0,0 +1,91 @@
+"""
+Digest broadcast benchmark.
+Fans a digest out to a large synthetic subscriber base through a fake
+bot with the rate-limit pause disabled, reporting throughput, how many
+distinct digests were rendered and peak Python memory.
+Run with: python -m benchmarks.bench_digest [subscribers]
+"""
+
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.data.currency_data import CurrencyData
+from src.services.digest_service import DigestService
+from src.services.subscription_store import SubscriptionStore
+
+
+class StubAPIService:
+    """Fixed snapshots so the benchmark never touches the network"""
+
+    async def get_current_rates(self):
+        return {'date': '2025-07-02', 'usd': {code: 1.0 + i for i, code in enumerate(CurrencyData.CURRENCIES)}}
+
+    def get_archive_baseline(self, current_data):
+        return {'label': 'Currency API', **current_data}
+
+    async def get_historical_rates(self, date):
+        return {'date': date, 'usd': {code: 1.01 + i for i, code in enumerate(CurrencyData.CURRENCIES)}}
+
+
+class CountingBot:
+    """Bot stand-in that only counts sends"""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.sent += 1
+
+
+def populate(path: str, subscribers: int) -> None:
+    """Bulk insert subscribers choosing from a small set of popular pair combinations"""
+    popular = [
+        SubscriptionStore.encode_pairs(random.sample(
+            [('usd', 'khr'), ('usd', 'thb'), ('eur', 'usd'), ('usd', 'vnd'), ('sgd', 'myr'), ('usd', 'jpy')],
+            k=random.randint(1, 3)
+        ))
+        for _ in range(200)
+    ]
+    SubscriptionStore(path).close()
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO subscriptions (chat_id, pairs) VALUES (?, ?)",
+            ((chat_id, random.choice(popular)) for chat_id in range(subscribers))
+        )
+
+
+async def run(subscribers: int) -> None:
+    """Broadcast to every subscriber and report the cost"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, "subscriptions.sqlite3")
+        populate(path, subscribers)
+
+        store = SubscriptionStore(path)
+        service = DigestService(StubAPIService(), store)
+        service.MESSAGES_PER_SECOND = float('inf')
+        service.BATCH_SIZE = 1000
+        bot = CountingBot()
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        stats = await service.broadcast(bot, "benchmark")
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        store.close()
+
+    print(f"subscribers: {subscribers:,}  sent: {bot.sent:,}  distinct digests rendered: {stats['digests']}")
+    print(f"fan-out time without rate-limit pauses: {elapsed:.2f} s ({bot.sent / elapsed:,.0f} msg/s)")
+    print(f"peak traced memory: {peak / 1024:.0f} KiB")
+    print(f"at {DigestService.MESSAGES_PER_SECOND} msg/s the real broadcast takes "
+          f"{subscribers / DigestService.MESSAGES_PER_SECOND / 60:.0f} min")
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,61 @@
+"""
+Rate provider benchmark.
+Merges stub providers with different latencies through RateAggregator and
+compares the wall time against fetching the same providers one after the
+other, including a provider that hangs past every timeout.
+Run with: python -m benchmarks.bench_providers [delay_scale]
+"""
+
+import asyncio
+import sys
+import time
+
+from src.services.rate_aggregator import RateAggregator
+from src.services.rate_providers import StubProvider
+
+RATES = {'usd': 1.0, 'khr': 4012.35, 'thb': 32.46, 'eur': 0.851, 'jpy': 144.12}
+
+
+def build_providers(scale: float):
+    """Providers with staggered freshness and latency; the last never answers in time"""
+    now = time.time()
+    return [
+        StubProvider("daily", RATES, timestamp=now - 20 * 3600, delay=0.2 * scale, label="Daily dataset"),
+        StubProvider("hourly", {**RATES, 'khr': 4105.0}, timestamp=now - 3600, delay=0.8 * scale, label="Hourly API"),
+        StubProvider("local", {'khr': 4098.0}, timestamp=now - 1800, delay=0.05 * scale, label="Local market"),
+        StubProvider("hung", RATES, timestamp=now, delay=60.0, label="Hung upstream"),
+    ]
+
+
+async def sequential(providers):
+    """Fetch each provider in turn with its own timeout, as a single-source loop would"""
+    started = time.perf_counter()
+    for provider in providers:
+        try:
+            await asyncio.wait_for(provider.fetch(), provider.TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+    return time.perf_counter() - started
+
+
+async def main(scale: float) -> None:
+    providers = build_providers(scale)
+    aggregator = RateAggregator(providers)
+
+    started = time.perf_counter()
+    merged = await aggregator.fetch()
+    merged_time = time.perf_counter() - started
+
+    print(f"Providers: {', '.join(provider.name for provider in providers)}")
+    print(f"Concurrent merge:  {merged_time:.2f}s (deadline {aggregator.DEADLINE}s, "
+          f"per-provider timeout {providers[0].TIMEOUT}s)")
+    print(f"Sequential fetch:  {await sequential(providers):.2f}s")
+    print("\nMerged rates:")
+    for code, rate in sorted(merged['usd'].items()):
+        source = merged['provenance'][code]
+        age_hours = (time.time() - source['timestamp']) / 3600
+        print(f"  {code.upper():4} {rate:>10.3f}  from {source['label']} ({age_hours:.1f}h old)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0))
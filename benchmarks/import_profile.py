@@ -0,0 +1,40 @@
+"""
+Import-time profile.
+Runs a fresh interpreter with -X importtime and lists the slowest
+imports (cumulative) pulled in by the bot at startup.
+Run with: python -m benchmarks.import_profile [module] [top_n]
+"""
+
+import subprocess
+import sys
+
+
+def profile_imports(module: str = "src.bot.xchange_bot", top_n: int = 20) -> None:
+    """Print the slowest imports triggered by importing module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if self_us.strip().isdigit():
+            entries.append((int(cumulative_us), int(self_us), name.strip()))
+
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1])
+        return
+
+    total = max(entries)[0] if entries else 0
+    print(f"import {module}: {total / 1000:.1f} ms cumulative")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative, self_time, name in sorted(entries, reverse=True)[:top_n]:
+        print(f"{cumulative / 1000:>14.1f} {self_time / 1000:>8.1f}  {name}")
+
+
+if __name__ == '__main__':
+    profile_imports(*sys.argv[1:2], *(int(arg) for arg in sys.argv[2:3]))
@@ -5,6 +5,7 @@ import logging
 from dotenv import load_dotenv
 
 from src.bot.xchange_bot import XChangeBot
+from src.utils.tracing import tracer
 
 # Configure logging
 logging.basicConfig(
@@ -24,7 +25,24 @@ def main():
         logger.error("Error: TELEGRAM_BOT_API not found in environment variables")
         exit(1)
     
-    bot = XChangeBot(bot_token)
+    tracer.configure_from_spec(
+        os.getenv("TRACE_EXPORT"),
+        float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+    )
+    
+    subscriptions_db = os.getenv("SUBSCRIPTIONS_DB")
+    if not subscriptions_db:
+        logger.warning(
+            "SUBSCRIPTIONS_DB is not set; digest subscriptions and broadcast checkpoints are kept in "
+            "XCHANGE_DATA_DIR and are lost whenever that directory is wiped (e.g. on every dyno restart)"
+        )
+    
+    bot = XChangeBot(
+        bot_token,
+        data_dir=os.getenv("XCHANGE_DATA_DIR", ".cache"),
+        ready_file=os.getenv("READY_FILE"),
+        subscriptions_db=subscriptions_db
+    )
     bot.run()
 
 
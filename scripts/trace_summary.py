@@ -0,0 +1,88 @@
+"""
+Trace summary script.
+Reads spans exported by JsonlSpanExporter and prints per-stage latency
+statistics plus, for each update type, how its time splits across the
+direct child stages (API fetch, message building, Telegram calls).
+Run with: python -m scripts.trace_summary traces.jsonl
+"""
+
+import json
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+def load_spans(path: str) -> List[Dict]:
+    """Load spans from a JSONL file, skipping malformed lines"""
+    spans = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def print_stage_table(spans: List[Dict]) -> None:
+    """Print count and latency percentiles per span name"""
+    durations = defaultdict(list)
+    for span in spans:
+        durations[span['name']].append(span['duration_ms'])
+
+    print(f"{'stage':<36} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'errors':>7}")
+    errors = defaultdict(int)
+    for span in spans:
+        if span.get('status') == 'error':
+            errors[span['name']] += 1
+    for name in sorted(durations, key=lambda n: -sum(durations[n])):
+        values = sorted(durations[name])
+        print(f"{name:<36} {len(values):>7} {percentile(values, 0.5):>9.1f} "
+              f"{percentile(values, 0.95):>9.1f} {values[-1]:>9.1f} {errors[name]:>7}")
+
+
+def print_breakdown(spans: List[Dict]) -> None:
+    """Print, per root span name, the average share of time spent in each direct child stage"""
+    children = defaultdict(list)
+    for span in spans:
+        if span.get('parent_id'):
+            children[span['parent_id']].append(span)
+
+    totals = defaultdict(lambda: defaultdict(float))
+    counts = defaultdict(int)
+    for root in (span for span in spans if not span.get('parent_id')):
+        counts[root['name']] += 1
+        totals[root['name']]['total'] += root['duration_ms']
+        accounted = 0.0
+        for child in children[root['span_id']]:
+            totals[root['name']][child['name']] += child['duration_ms']
+            accounted += child['duration_ms']
+        totals[root['name']]['(self/other)'] += max(0.0, root['duration_ms'] - accounted)
+
+    for name in sorted(counts):
+        stages = totals[name]
+        total = stages.pop('total')
+        print(f"\n{name}: {counts[name]} traces, mean {total / counts[name]:.1f} ms")
+        for stage, duration in sorted(stages.items(), key=lambda item: -item[1]):
+            share = duration / total * 100 if total else 0.0
+            print(f"  {stage:<34} {duration / counts[name]:>9.1f} ms {share:>6.1f}%")
+
+
+def main(path: str) -> None:
+    """Summarize a trace file"""
+    spans = load_spans(path)
+    if not spans:
+        print(f"No spans found in {path}")
+        return
+    print_stage_table(spans)
+    print_breakdown(spans)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else "traces.jsonl")
@@ -0,0 +1,16 @@
+"""Telegram request class that records each Bot API call as a span"""
+
+from telegram.request import HTTPXRequest
+
+from ..utils.tracing import tracer
+
+
+class TracedHTTPXRequest(HTTPXRequest):
+    """HTTPXRequest wrapping every Bot API call (answerCallbackQuery, sendMessage, ...) in a span"""
+
+    async def do_request(self, url: str, method: str, *args, **kwargs):
+        """Perform the request inside a span named after the Bot API method"""
+        with tracer.span(f"telegram.{url.rsplit('/', 1)[-1]}") as span:
+            code, payload = await super().do_request(url, method, *args, **kwargs)
+            span.set_attribute('http.status_code', code)
+            return code, payload
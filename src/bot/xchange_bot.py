@@ -1,17 +1,29 @@
 """Main XChange Bot class and handlers"""
 
+import asyncio
+import contextvars
 import logging
 import os
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import time
+from typing import Callable, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
 from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes, CallbackQueryHandler
 
 from ..data.currency_data import CurrencyData
+from ..handlers.throttle import RequestThrottle
 from ..services.api_service import APIService
+from ..services.conversion_engine import ConversionEngine
+from ..services.digest_service import DigestService
+from ..services.snapshot_store import SnapshotStore
+from ..services.subscription_store import SubscriptionStore
 from ..utils.formatter import MessageFormatter
 from ..utils.keyboard_builder import KeyboardBuilder
+from ..utils.tracing import tracer
+from .traced_request import TracedHTTPXRequest
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -20,12 +32,131 @@ logger = logging.getLogger(__name__)
 class XChangeBot:
     """Main bot class for XChange currency bot"""
     
-    def __init__(self, token: str):
-        self.app = ApplicationBuilder().token(token).build()
-        self.api_service = APIService()
+    TREND_DAYS = 7
+    WARMUP_TIMEOUT = 8
+    
+    def __init__(self, token: str, data_dir: Optional[str] = None, ready_file: Optional[str] = None,
+                 subscriptions_db: Optional[str] = None):
+        self.app = (
+            ApplicationBuilder()
+            .token(token)
+            .request(TracedHTTPXRequest(connection_pool_size=256))
+            .post_init(self.warmup)
+            .concurrent_updates(True)
+            .post_shutdown(self._on_shutdown)
+            .build()
+        )
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+        self.api_service = APIService(SnapshotStore(data_dir) if data_dir else None)
+        if not subscriptions_db:
+            subscriptions_db = os.path.join(data_dir, "subscriptions.sqlite3") if data_dir else ":memory:"
+        elif os.path.dirname(subscriptions_db):
+            os.makedirs(os.path.dirname(subscriptions_db), exist_ok=True)
+        self.subscription_store = SubscriptionStore(subscriptions_db)
+        self.digest_service = DigestService(self.api_service, self.subscription_store)
         self.formatter = MessageFormatter()
+        self.conversion_engine = ConversionEngine()
         self.keyboard_builder = KeyboardBuilder()
+        self.throttle = RequestThrottle()
+        self.ready_file = ready_file
+        self._warm_task: Optional[asyncio.Task] = None
+        self._static_messages: Dict[str, str] = {}
+        # Rendered rates tables per base for the snapshot they were built from
+        self._rates_snapshot: Optional[Dict] = None
+        self._rates_messages: Dict[str, str] = {}
+        self._chart_service = None
         self.setup_handlers()
+        self.setup_jobs()
+
+    @property
+    def chart_service(self):
+        """Chart service, imported on first use since charts are rarely requested"""
+        if self._chart_service is None:
+            from ..services.chart_service import ChartService
+            self._chart_service = ChartService(self.api_service)
+        return self._chart_service
+
+    # Lifecycle
+    async def warmup(self, application=None) -> None:
+        """Load persisted snapshots and prebuild static content before serving traffic"""
+        started = time.perf_counter()
+        
+        loaded = await asyncio.to_thread(self.api_service.load_snapshots)
+        self._prebuild_static_content()
+        
+        # Persisted rates are served at once, even if stale; only an empty store waits for upstream
+        if loaded == 0:
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(self.api_service.get_current_rates()), self.WARMUP_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Warmup fetch timed out; first requests will wait for rates")
+        self._warm_task = asyncio.create_task(self._warm_caches(), context=contextvars.Context())
+        
+        await self._resume_interrupted_digest()
+        
+        if self.ready_file:
+            with open(self.ready_file, 'w', encoding='utf-8') as f:
+                f.write(f"{time.time():.0f}\n")
+        logger.info(
+            f"Bot ready in {(time.perf_counter() - started) * 1000:.0f} ms "
+            f"({loaded} persisted snapshots, fresh rates: {self.api_service.has_fresh_rates()})"
+        )
+
+    async def _warm_caches(self) -> None:
+        """Refresh rates, prerender every rates table and prefetch trend history after startup"""
+        try:
+            current_data = await self.api_service.refresh_in_background()
+            if not current_data:
+                return
+            for base in CurrencyData.get_currencies():
+                self._get_rates_message(current_data, base)
+            baseline = self.api_service.get_archive_baseline(current_data)
+            if baseline:
+                await self.api_service.get_historical_rates(self._get_trend_past_date(baseline.get('date')))
+        except Exception as e:
+            logger.warning(f"Background cache warming failed: {e}")
+
+    async def _resume_interrupted_digest(self) -> None:
+        """Restart today's digest broadcast if a previous process stopped mid-way"""
+        if not self.app.job_queue:
+            return
+        
+        run_id = await asyncio.to_thread(self.subscription_store.get_unfinished_run)
+        if run_id and run_id == self.digest_service.get_run_id():
+            logger.info(f"Resuming interrupted digest broadcast {run_id}")
+            self.app.job_queue.run_once(self.send_daily_digest, when=0, data=run_id, name="daily_digest_resume")
+
+    async def send_daily_digest(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Job callback broadcasting the daily digest"""
+        run_id = context.job.data or self.digest_service.get_run_id()
+        try:
+            stats = await self.digest_service.broadcast(context.bot, run_id)
+            # Another process holds the run; try again once its lease could have lapsed
+            if stats.get('skipped') == 'leased' and context.job_queue:
+                context.job_queue.run_once(
+                    self.send_daily_digest, when=DigestService.LEASE_SECONDS, data=run_id, name="daily_digest_retry"
+                )
+        except Exception as e:
+            logger.error(f"Error in send_daily_digest for {run_id}: {e}")
+
+    def _prebuild_static_content(self) -> None:
+        """Build messages and keyboards that never change"""
+        self._static_messages = {
+            'help': self._build_help_message(),
+            'currencies': self._build_currencies_message(),
+            'convert_help': self._build_convert_help_message()
+        }
+        self.keyboard_builder.get_main_menu_keyboard()
+        self.keyboard_builder.get_back_to_menu_keyboard()
+
+    def _get_static_message(self, name: str) -> str:
+        """Get a prebuilt static message, building it if warmup has not run"""
+        if name not in self._static_messages:
+            self._prebuild_static_content()
+        return self._static_messages[name]
 
     # Event Handlers
     async def button_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -42,7 +173,8 @@ class XChangeBot:
             "main_menu": self.button_main_menu
         }
         
-        handler = callback_handlers.get(query.data)
+        # Data may carry an argument after a colon, e.g. "rates:khr"
+        handler = callback_handlers.get(query.data.split(':', 1)[0])
         if handler:
             await handler(update, context)
         else:
@@ -50,8 +182,10 @@ class XChangeBot:
 
     # Button Handlers
     async def button_get_rates(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Handle rates button press"""
+        """Handle rates and base selector button presses"""
         query = update.callback_query
+        _, _, base = query.data.partition(':')
+        base = base if CurrencyData.is_supported_currency(base) else 'usd'
         
         try:
             data = await self.api_service.get_current_rates()
@@ -61,8 +195,9 @@ class XChangeBot:
                 )
                 return
             
-            message = self._build_rates_message(data)
-            keyboard = self.keyboard_builder.get_back_to_menu_keyboard()
+            with tracer.span("build.rates", base=base):
+                message = self._get_rates_message(data, base)
+            keyboard = self.keyboard_builder.get_rates_base_keyboard(base)
             
             await query.edit_message_text(
                 message, 
@@ -70,6 +205,10 @@ class XChangeBot:
                 reply_markup=keyboard
             )
             
+        except BadRequest as e:
+            # Tapping the base that is already shown leaves the message unchanged
+            if "not modified" not in str(e):
+                logger.error(f"Error in button_get_rates: {e}")
         except Exception as e:
             logger.error(f"Error in button_get_rates: {e}")
             await query.edit_message_text(
@@ -80,7 +219,7 @@ class XChangeBot:
         """Handle currency list button press"""
         query = update.callback_query
         
-        message = self._build_currencies_message()
+        message = self._get_static_message('currencies')
         keyboard = self.keyboard_builder.get_back_to_menu_keyboard()
         
         await query.edit_message_text(
@@ -94,7 +233,8 @@ class XChangeBot:
         query = update.callback_query
         
         try:
-            message = await self._build_trends_message()
+            with tracer.span("build.trends"):
+                message = await self._build_trends_message()
             keyboard = self.keyboard_builder.get_back_to_menu_keyboard()
             
             await query.edit_message_text(
@@ -113,7 +253,7 @@ class XChangeBot:
         """Handle convert help button press"""
         query = update.callback_query
         
-        message = self._build_convert_help_message()
+        message = self._get_static_message('convert_help')
         keyboard = self.keyboard_builder.get_back_to_menu_keyboard()
         
         await query.edit_message_text(
@@ -126,7 +266,7 @@ class XChangeBot:
         """Handle help button press"""
         query = update.callback_query
         
-        message = self._build_help_message()
+        message = self._get_static_message('help')
         keyboard = self.keyboard_builder.get_back_to_menu_keyboard()
         
         await query.edit_message_text(
@@ -162,7 +302,7 @@ class XChangeBot:
 
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /help command"""
-        message = self._build_help_message()
+        message = self._get_static_message('help')
         keyboard = self.keyboard_builder.get_back_to_menu_keyboard()
         
         await update.message.reply_text(
@@ -173,12 +313,23 @@ class XChangeBot:
 
     async def get_currencies(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /currency command - show supported currencies"""
-        message = self._build_currencies_message()
+        message = self._get_static_message('currencies')
         await update.message.reply_text(message, parse_mode='Markdown')
 
     async def get_rates(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /rates command - show live exchange rates"""
         try:
+            args = context.args or []
+            base = args[0].lower() if args else 'usd'
+            if len(args) > 1 or not CurrencyData.is_supported_currency(base):
+                await update.message.reply_text(
+                    f"❌ **'{' '.join(args).upper()}' is not a supported base!**\n\n"
+                    "Use: `/rates [BASE]`\n"
+                    "Example: `/rates KHR`",
+                    parse_mode='Markdown'
+                )
+                return
+            
             data = await self.api_service.get_current_rates()
             if not data:
                 await update.message.reply_text(
@@ -186,8 +337,10 @@ class XChangeBot:
                 )
                 return
             
-            message = self._build_rates_message(data)
-            await update.message.reply_text(message, parse_mode='Markdown')
+            with tracer.span("build.rates", base=base):
+                message = self._get_rates_message(data, base)
+            keyboard = self.keyboard_builder.get_rates_base_keyboard(base)
+            await update.message.reply_text(message, parse_mode='Markdown', reply_markup=keyboard)
             
         except Exception as e:
             logger.error(f"Error in get_rates: {e}")
@@ -198,7 +351,8 @@ class XChangeBot:
     async def get_trends(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /trends command - show currency trends"""
         try:
-            message = await self._build_trends_message()
+            with tracer.span("build.trends"):
+                message = await self._build_trends_message()
             await update.message.reply_text(message, parse_mode='Markdown')
             
         except Exception as e:
@@ -207,13 +361,77 @@ class XChangeBot:
                 "❌ An error occurred while fetching trend data. Please try again later."
             )
 
+    async def chart(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /chart command - send a trend chart image"""
+        try:
+            validation_result = self._validate_chart_args(context.args or [])
+            if validation_result['error']:
+                await update.message.reply_text(
+                    validation_result['message'],
+                    parse_mode='Markdown'
+                )
+                return
+            
+            with tracer.span("build.chart"):
+                result = await self.chart_service.get_chart(
+                    validation_result['currency'],
+                    validation_result['days']
+                )
+            if result['error']:
+                await update.message.reply_text(result['message'])
+                return
+            
+            # Reuse the Telegram file_id after the first upload instead of re-sending bytes
+            sent = await update.message.reply_photo(
+                photo=result['file_id'] or result['png'],
+                caption=self._build_chart_caption(result),
+                parse_mode='Markdown'
+            )
+            if not result['file_id'] and sent.photo:
+                self.chart_service.remember_file_id(result['key'], sent.photo[-1].file_id)
+            
+        except Exception as e:
+            logger.error(f"Error in chart: {e}")
+            await update.message.reply_text(
+                "❌ An error occurred while drawing the chart. Please try again later."
+            )
+
+    async def digest(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /digest command - manage the daily digest subscription"""
+        try:
+            args = context.args or []
+            chat_id = update.effective_chat.id
+            
+            if not args:
+                pairs = await asyncio.to_thread(self.subscription_store.get_pairs, chat_id)
+                message = self._build_digest_status_message(pairs)
+            elif len(args) == 1 and args[0].lower() == 'off':
+                await asyncio.to_thread(self.subscription_store.unsubscribe, chat_id)
+                message = "🔕 **Daily digest turned off.**\n\nUse `/digest USD/KHR` to subscribe again."
+            else:
+                validation_result = self._validate_digest_args(args)
+                if validation_result['error']:
+                    message = validation_result['message']
+                else:
+                    pairs = validation_result['pairs']
+                    await asyncio.to_thread(self.subscription_store.subscribe, chat_id, pairs)
+                    message = self._build_digest_status_message(pairs)
+            
+            await update.message.reply_text(message, parse_mode='Markdown')
+            
+        except Exception as e:
+            logger.error(f"Error in digest: {e}")
+            await update.message.reply_text(
+                "❌ An error occurred while updating your digest. Please try again later."
+            )
+
     async def convert(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /convert command - convert between currencies"""
         try:
             args = context.args
             
             if not args:
-                message = self._build_convert_help_message()
+                message = self._get_static_message('convert_help')
                 await update.message.reply_text(message, parse_mode='Markdown')
                 return
             
@@ -237,7 +455,8 @@ class XChangeBot:
                 await update.message.reply_text(conversion_result['message'])
                 return
             
-            message = self._build_conversion_result_message(conversion_result)
+            with tracer.span("build.conversion"):
+                message = self._build_conversion_result_message(conversion_result)
             await update.message.reply_text(message, parse_mode='Markdown')
             
         except Exception as e:
@@ -280,9 +499,11 @@ Ready to start exchanging? 🚀"""
 
 **Available Commands:**
 • `/start` - Welcome message and main menu
-• `/rates` - View live exchange rates (USD base)
+• `/rates [BASE]` - View live exchange rates (USD base by default)
 • `/currency` - List all supported currencies
 • `/trends` - View 7-day currency trends
+• `/chart <currency> [days]` - Trend chart vs USD
+• `/digest <FROM/TO> ...` - Daily digest of your pairs (`/digest off` to stop)
 • `/convert <amount> <from> <to>` - Convert currencies
 • `/help` - Show this help message
 
@@ -310,58 +531,106 @@ Ready to start exchanging? 🚀"""
         
         return message
     
-    def _build_rates_message(self, data: Dict) -> str:
+    def _get_rates_message(self, data: Dict, base: str = 'usd') -> str:
+        """Get the rates table for a base, rendering it once per snapshot"""
+        if data is not self._rates_snapshot:
+            self._rates_snapshot = data
+            self._rates_messages = {}
+        
+        message = self._rates_messages.get(base)
+        if message is None:
+            message = self._rates_messages[base] = self._build_rates_message(data, base)
+        return message
+    
+    def _rebase_rates(self, usd_rates: Dict, base: str) -> Dict:
+        """Derive rates against any base from the single USD snapshot"""
+        base_rate = 1.0 if base == 'usd' else usd_rates.get(base)
+        if not base_rate:
+            return {}
+        return {
+            code: (1.0 if code == 'usd' else usd_rates[code]) / base_rate
+            for code in CurrencyData.CURRENCIES
+            if code == 'usd' or code in usd_rates
+        }
+    
+    def _build_rates_message(self, data: Dict, base: str = 'usd') -> str:
         """Build exchange rates message"""
-        usd_rates = data.get('usd', {})
+        rates = self._rebase_rates(data.get('usd', {}), base)
         date = data.get('date', 'Unknown')
         
-        message = f"💱 **Live Exchange Rates (USD Base)**\n"
+        message = f"💱 **Live Exchange Rates ({base.upper()} Base)**\n"
         message += f"📅 Updated: {date}\n\n"
         
-        # Show USD first
-        flag_emoji = self._get_flag_emoji('usd')
-        message += f"{flag_emoji} **USD** = $1.00 (Base)\n"
+        if not rates:
+            return message + "❌ Rates for this base are temporarily unavailable."
+        
+        # Rates are marked with their source; a rebased table also depends on the base's source
+        markers, legend = self._build_sources_legend(data.get('provenance', {}), rates)
+        
+        # Show the base first
+        flag_emoji = self._get_flag_emoji(base)
+        base_symbol = self._get_currency_symbol(base)
+        message += f"{flag_emoji} **{base.upper()}** = {base_symbol}1.00 (Base){markers.get(base, '')}\n"
         
         # Show other currencies
         for code in CurrencyData.get_currencies():
-            if code != 'usd' and code in usd_rates:
-                rate = usd_rates[code]
+            if code != base and code in rates:
+                rate = rates[code]
                 flag_emoji = self._get_flag_emoji(code)
                 formatted_rate = self.formatter.format_rate(rate)
                 currency_symbol = self._get_currency_symbol(code)
-                message += f"{flag_emoji} **{code.upper()}** = {currency_symbol}{formatted_rate}\n"
+                message += f"{flag_emoji} **{code.upper()}** = {currency_symbol}{formatted_rate}{markers.get(code, '')}\n"
         
-        message += f"\n💡 *1 USD equals the amounts shown above*"
+        message += f"\n💡 *1 {base.upper()} equals the amounts shown above*"
+        if legend:
+            message += f"\n\n📡 Sources:\n{legend}"
         return message
     
+    def _build_sources_legend(self, provenance: Dict, codes) -> tuple:
+        """Number each source used by codes, returning per-code markers and the legend"""
+        if not provenance:
+            return {}, ""
+        
+        superscripts = "¹²³⁴⁵⁶⁷⁸⁹"
+        numbers: Dict[str, str] = {}
+        legend_lines = []
+        markers = {}
+        for code in codes:
+            source = provenance.get(code)
+            if not source or code == 'usd':
+                continue
+            if source['source'] not in numbers:
+                numbers[source['source']] = superscripts[len(numbers) % len(superscripts)]
+                legend_lines.append(f"{numbers[source['source']]} {self.formatter.format_source(source)}")
+            markers[code] = numbers[source['source']]
+        return markers, "\n".join(legend_lines)
+    
     async def _build_trends_message(self) -> str:
         """Build currency trends message"""
-        days_to_analyze = 7
+        days_to_analyze = self.TREND_DAYS
         
         # Get current rates
         current_data = await self.api_service.get_current_rates()
         if not current_data:
             return "❌ Sorry, I couldn't fetch trend data. Please try again later."
         
-        current_rates = current_data.get('usd', {})
-        current_date = current_data.get('date', 'Unknown')
+        message = f"📊 **Currency Trends (Last {days_to_analyze} Days)**\n\n"
         
-        # Calculate past date
-        try:
-            current_datetime = datetime.strptime(current_date, '%Y-%m-%d')
-            past_datetime = current_datetime - timedelta(days=days_to_analyze)
-            past_date = past_datetime.strftime('%Y-%m-%d')
-        except:
-            past_date = "2025-06-23"
+        # Both ends come from the archived dataset; merged rates from other providers would show phantom moves
+        baseline = self.api_service.get_archive_baseline(current_data)
+        if not baseline:
+            return message + "❌ Historical data temporarily unavailable."
+        current_rates = baseline.get('usd', {})
+        current_date = baseline.get('date', 'Unknown')
         
         # Get past rates
+        past_date = self._get_trend_past_date(current_date)
         past_data = await self.api_service.get_historical_rates(past_date)
         
-        message = f"📊 **Currency Trends (Last {days_to_analyze} Days)**\n\n"
-        
         if past_data and past_data.get('usd'):
             past_rates = past_data.get('usd', {})
-            message += f"📅 From: {past_date} → {current_date}\n\n"
+            message += f"📅 From: {past_date} → {current_date}\n"
+            message += f"📡 Source: {baseline['label']} (both dates)\n\n"
             
             for code in CurrencyData.get_currencies()[:10]:  # Limit to first 10
                 if code != 'usd' and code in current_rates and code in past_rates:
@@ -393,6 +662,15 @@ Ready to start exchanging? 🚀"""
         
         return message
     
+    def _get_trend_past_date(self, current_date: Optional[str]) -> str:
+        """Calculate the start date of the trend window"""
+        try:
+            current_datetime = datetime.strptime(current_date, '%Y-%m-%d')
+            past_datetime = current_datetime - timedelta(days=self.TREND_DAYS)
+            return past_datetime.strftime('%Y-%m-%d')
+        except (TypeError, ValueError):
+            return "2025-06-23"
+    
     def _build_convert_help_message(self) -> str:
         """Build convert help message"""
         currency_list = ", ".join([code.upper() for code in CurrencyData.get_currencies()])
@@ -411,6 +689,90 @@ Ready to start exchanging? 🚀"""
 
 💡 *Amount can be decimal (e.g., 100.50)*"""
     
+    def _validate_chart_args(self, args: List[str]) -> Dict:
+        """Validate chart arguments"""
+        chart_service = self.chart_service
+        usage = ("Use: `/chart <currency> [days]`\n"
+                 f"Example: `/chart EUR {chart_service.DEFAULT_DAYS}`")
+        
+        if not 1 <= len(args) <= 2:
+            return {'error': True, 'message': f"❌ **Invalid format!**\n\n{usage}"}
+        
+        currency = args[0].lower()
+        if not CurrencyData.is_supported_currency(currency) or currency == 'usd':
+            return {
+                'error': True,
+                'message': f"❌ **'{currency.upper()}' cannot be charted!**\n\n"
+                          f"Pick a supported currency other than USD.\n{usage}"
+            }
+        
+        days = chart_service.DEFAULT_DAYS
+        if len(args) == 2:
+            try:
+                days = int(args[1])
+            except ValueError:
+                days = 0
+            if not chart_service.MIN_DAYS <= days <= chart_service.MAX_DAYS:
+                return {
+                    'error': True,
+                    'message': f"❌ **Invalid number of days!**\n\n"
+                              f"Choose between {chart_service.MIN_DAYS} and {chart_service.MAX_DAYS} days.\n{usage}"
+                }
+        
+        return {'error': False, 'currency': currency, 'days': days}
+    
+    def _build_chart_caption(self, result: Dict) -> str:
+        """Build chart photo caption"""
+        code = result['currency']
+        change_percent = ((result['last'] - result['first']) / result['first']) * 100
+        flag_emoji = self._get_flag_emoji(code)
+        
+        return (f"{flag_emoji} **{code.upper()} per 1 USD - last {result['days']} days**\n"
+                f"📅 {result['start_date']} → {result['end_date']}\n"
+                f"Now: {self.formatter.format_rate(result['last'])} "
+                f"({self.formatter.format_percentage(change_percent)})\n"
+                f"Low: {self.formatter.format_rate(result['low'])} · "
+                f"High: {self.formatter.format_rate(result['high'])}")
+    
+    def _validate_digest_args(self, args: List[str]) -> Dict:
+        """Validate digest pair arguments"""
+        usage = "Use: `/digest <FROM/TO> ...`\nExample: `/digest USD/KHR EUR/THB`"
+        max_pairs = self.digest_service.MAX_PAIRS
+        
+        if len(args) > max_pairs:
+            return {'error': True, 'message': f"❌ **Too many pairs!**\n\nPick up to {max_pairs} pairs.\n{usage}"}
+        
+        pairs = []
+        for arg in args:
+            parts = arg.lower().replace('-', '/').split('/')
+            if len(parts) != 2 or parts[0] == parts[1]:
+                return {'error': True, 'message': f"❌ **Invalid pair '{arg}'!**\n\n{usage}"}
+            for code in parts:
+                if not CurrencyData.is_supported_currency(code):
+                    return {
+                        'error': True,
+                        'message': f"❌ **'{code.upper()}' is not supported!**\n\n"
+                                  f"Use `/currency` to see supported currencies."
+                    }
+            pairs.append((parts[0], parts[1]))
+        
+        return {'error': False, 'pairs': pairs}
+    
+    def _build_digest_status_message(self, pairs: List) -> str:
+        """Build digest subscription status message"""
+        schedule = f"{self.digest_service.digest_time} ({self.digest_service.digest_timezone})"
+        if not pairs:
+            return ("☀️ **Daily Digest**\n\n"
+                    f"Get a summary of your currency pairs every day at {schedule}.\n\n"
+                    "Use: `/digest <FROM/TO> ...`\n"
+                    "Example: `/digest USD/KHR EUR/THB`")
+        
+        pair_list = ", ".join(f"{base.upper()}/{quote.upper()}" for base, quote in pairs)
+        return ("✅ **Daily digest is on**\n\n"
+                f"📋 Pairs: {pair_list}\n"
+                f"⏰ Sent daily at {schedule}\n\n"
+                "💡 *Use /digest off to unsubscribe*")
+    
     def _validate_convert_args(self, args: List[str]) -> Dict:
         """Validate conversion arguments"""
         if len(args) != 3:
@@ -423,8 +785,10 @@ Ready to start exchanging? 🚀"""
         
         # Extract and validate amount
         try:
-            amount = float(args[0])
-        except ValueError:
+            amount = Decimal(args[0].replace(',', ''))
+        except InvalidOperation:
+            amount = None
+        if amount is None or not amount.is_finite():
             return {
                 'error': True,
                 'message': "❌ **Invalid amount!**\n\n"
@@ -432,6 +796,23 @@ Ready to start exchanging? 🚀"""
                           "Example: `/convert 100 USD EUR`"
             }
         
+        if abs(amount) > ConversionEngine.MAX_AMOUNT:
+            return {
+                'error': True,
+                'message': "❌ **Amount too large!**\n\n"
+                          "Please enter a smaller amount."
+            }
+        
+        # Checked on the digits as typed, before anything expands an exponent like 1E-100000000
+        amount_digits = amount.as_tuple()
+        if (amount_digits.exponent < -ConversionEngine.MAX_FRACTION_DIGITS
+                or len(amount_digits.digits) > ConversionEngine.MAX_SIGNIFICANT_DIGITS):
+            return {
+                'error': True,
+                'message': "❌ **Amount too precise!**\n\n"
+                          f"Please use at most {ConversionEngine.MAX_FRACTION_DIGITS} decimal places."
+            }
+        
         from_currency = args[1].lower()
         to_currency = args[2].lower()
         
@@ -457,7 +838,7 @@ Ready to start exchanging? 🚀"""
             'to_currency': to_currency
         }
     
-    async def _perform_conversion(self, amount: float, from_currency: str, to_currency: str) -> Dict:
+    async def _perform_conversion(self, amount: Decimal, from_currency: str, to_currency: str) -> Dict:
         """Perform currency conversion"""
         # Check if same currency
         if from_currency == to_currency:
@@ -478,29 +859,25 @@ Ready to start exchanging? 🚀"""
                 'message': "❌ Sorry, I couldn't fetch exchange rates. Please try again later."
             }
         
-        usd_rates = data.get('usd', {})
         date = data.get('date', 'Unknown')
         
         # Calculate conversion
-        if from_currency == 'usd':
-            if to_currency not in usd_rates:
-                return {'error': True, 'message': "❌ Exchange rate not available for this currency pair."}
-            converted_amount = amount * usd_rates[to_currency]
-        elif to_currency == 'usd':
-            if from_currency not in usd_rates:
-                return {'error': True, 'message': "❌ Exchange rate not available for this currency pair."}
-            converted_amount = amount / usd_rates[from_currency]
-        else:
-            if from_currency not in usd_rates or to_currency not in usd_rates:
-                return {'error': True, 'message': "❌ Exchange rate not available for this currency pair."}
-            usd_amount = amount / usd_rates[from_currency]
-            converted_amount = usd_amount * usd_rates[to_currency]
+        rate = self.conversion_engine.get_rate(data, from_currency, to_currency)
+        if rate is None:
+            return {'error': True, 'message': "❌ Exchange rate not available for this currency pair."}
+        converted_amount = self.conversion_engine.convert(amount, from_currency, to_currency, data)
         
         return {
             'error': False,
             'is_same_currency': False,
             'amount': amount,
             'converted_amount': converted_amount,
+            'rate': rate,
+            'sources': {
+                code: data['provenance'][code]
+                for code in (from_currency, to_currency)
+                if code != 'usd' and code in data.get('provenance', {})
+            },
             'from_currency': from_currency,
             'to_currency': to_currency,
             'date': date
@@ -510,10 +887,12 @@ Ready to start exchanging? 🚀"""
         """Build conversion result message"""
         if result.get('is_same_currency'):
             symbol = result['symbol']
-            amount = result['amount']
             currency = result['currency']
+            amount = self.formatter.format_decimal_amount(
+                self.conversion_engine.pad_amount(result['amount'], currency.lower())
+            )
             return f"💡 **Same currency!**\n\n" \
-                   f"{symbol}{amount:,.2f} {currency} = {symbol}{amount:,.2f} {currency}"
+                   f"{symbol}{amount} {currency} = {symbol}{amount} {currency}"
         
         amount = result['amount']
         converted_amount = result['converted_amount']
@@ -526,11 +905,11 @@ Ready to start exchanging? 🚀"""
         from_symbol = self._get_currency_symbol(from_currency)
         to_symbol = self._get_currency_symbol(to_currency)
         
-        formatted_amount = self.formatter.format_amount(amount)
-        formatted_converted = self.formatter.format_amount(converted_amount)
-        
-        exchange_rate = converted_amount / amount
-        formatted_rate = self.formatter.format_exchange_rate(exchange_rate)
+        formatted_amount = self.formatter.format_decimal_amount(
+            self.conversion_engine.pad_amount(amount, from_currency)
+        )
+        formatted_converted = self.formatter.format_decimal_amount(converted_amount)
+        formatted_rate = self.formatter.format_exchange_rate(result['rate'])
         
         return f"""💱 **Currency Conversion**
 
@@ -539,19 +918,74 @@ Ready to start exchanging? 🚀"""
 {to_flag} **{to_symbol}{formatted_converted} {to_currency.upper()}**
 
 📊 **Exchange Rate:** 1 {from_currency.upper()} = {formatted_rate} {to_currency.upper()}
-📅 **Updated:** {date}
+📅 **Updated:** {date}{self._build_conversion_sources_line(result.get('sources', {}))}
 
 💡 *Rates are live and may fluctuate*"""
 
+    def _build_conversion_sources_line(self, sources: Dict) -> str:
+        """Build the line naming where a conversion's rates came from"""
+        if not sources:
+            return ""
+        
+        distinct = {source['source']: source for source in sources.values()}
+        if len(distinct) == 1:
+            return f"\n📡 **Source:** {self.formatter.format_source(next(iter(distinct.values())))}"
+        
+        parts = [f"{code.upper()}: {self.formatter.format_source(source)}" for code, source in sources.items()]
+        return f"\n📡 **Sources:** {' · '.join(parts)}"
+
     def setup_handlers(self) -> None:
         """Setup all command and callback handlers"""
-        self.app.add_handler(CommandHandler("start", self.start))
-        self.app.add_handler(CommandHandler("currency", self.get_currencies))
-        self.app.add_handler(CommandHandler("rates", self.get_rates))
-        self.app.add_handler(CommandHandler("trends", self.get_trends))
-        self.app.add_handler(CommandHandler("convert", self.convert))
-        self.app.add_handler(CommandHandler("help", self.help_command))
-        self.app.add_handler(CallbackQueryHandler(self.button_callback))
+        commands = {
+            "start": self.start,
+            "currency": self.get_currencies,
+            "rates": self.get_rates,
+            "trends": self.get_trends,
+            "chart": self.chart,
+            "digest": self.digest,
+            "convert": self.convert,
+            "help": self.help_command
+        }
+        
+        # Every route is traced and goes through the throttle before reaching its handler
+        for command, callback in commands.items():
+            self.app.add_handler(CommandHandler(command, self._traced(self.throttle.wrap(callback, command), command)))
+        self.app.add_handler(CallbackQueryHandler(self._traced(self.throttle.wrap(self.button_callback))))
+
+    def _traced(self, callback: Callable, command: Optional[str] = None) -> Callable:
+        """Wrap a handler so each update it receives starts a (sampled) trace"""
+        async def traced_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+            name = command
+            if name is None and update.callback_query:
+                name = f"button.{(update.callback_query.data or 'unknown').split(':', 1)[0]}"
+            with tracer.start_trace(f"update.{name}", update_id=update.update_id):
+                return await callback(update, context)
+        return traced_callback
+
+    def setup_jobs(self) -> None:
+        """Schedule recurring jobs"""
+        if not self.app.job_queue:
+            logger.warning("JobQueue unavailable; install python-telegram-bot[job-queue] to enable daily digests")
+            return
+        
+        self.app.job_queue.run_daily(
+            self.send_daily_digest,
+            time=self.digest_service.get_schedule_time(),
+            name="daily_digest"
+        )
+        self.app.job_queue.run_repeating(self.throttle.log_metrics, interval=600, name="throttle_metrics")
+
+    async def _on_shutdown(self, application) -> None:
+        """Release background resources when the application stops"""
+        if self._warm_task:
+            self._warm_task.cancel()
+        if self._chart_service:
+            self._chart_service.shutdown()
+        self.api_service.shutdown()
+        self.subscription_store.close()
+        tracer.shutdown()
+        if self.ready_file and os.path.exists(self.ready_file):
+            os.remove(self.ready_file)
 
     def run(self) -> None:
         """Start the bot"""
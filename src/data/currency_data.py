@@ -96,6 +96,30 @@ class CurrencyData:
         'inr': '🇮🇳'   # India
     }
     
+    # Decimal places amounts are rounded to. ISO 4217 lists 2 for KHR, MMK,
+    # LAK and IDR, but their sub-units are not used in practice.
+    MINOR_UNITS = {
+        'khr': 0,
+        'usd': 2,
+        'cny': 2,
+        'jpy': 0,
+        'krw': 0,
+        'thb': 2,
+        'vnd': 0,
+        'mmk': 0,
+        'bnd': 2,
+        'lak': 0,
+        'sgd': 2,
+        'myr': 2,
+        'idr': 0,
+        'aud': 2,
+        'nzd': 2,
+        'chf': 2,
+        'eur': 2,
+        'gbp': 2,
+        'inr': 2
+    }
+    
     @classmethod
     def get_currencies(cls) -> list:
         """Get list of all supported currency codes"""
@@ -116,6 +140,11 @@ class CurrencyData:
         """Get full currency name for currency code"""
         return cls.CURRENCY_NAMES.get(currency_code.lower(), 'Unknown Currency')
     
+    @classmethod
+    def get_minor_units(cls, currency_code: str) -> int:
+        """Get the number of decimal places amounts in a currency are rounded to"""
+        return cls.MINOR_UNITS.get(currency_code.lower(), 2)
+    
     @classmethod
     def is_supported_currency(cls, currency_code: str) -> bool:
         """Check if currency code is supported"""
@@ -0,0 +1,174 @@
+"""
+Request throttling middleware.
+This module contains the RequestThrottle class that wraps command and
+callback handlers with per-user token buckets, per-command costs and a
+global concurrency cap on expensive handlers. Throttled requests fail
+fast with a friendly message instead of queueing.
+"""
+
+import logging
+import time
+from collections import Counter
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously over time"""
+
+    __slots__ = ('tokens', 'updated', 'notified')
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated = now
+        self.notified = False
+
+    def refill(self, capacity: float, rate: float, now: float) -> None:
+        """Add the tokens earned since the last update"""
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+
+class RequestThrottle:
+    """Class for throttling handlers per user and globally"""
+
+    BUCKET_CAPACITY = 12.0
+    REFILL_PER_SECOND = 0.5
+    DEFAULT_COST = 1.0
+    COMMAND_COSTS = {
+        'rates': 2.0,
+        'convert': 2.0,
+        'digest': 2.0,
+        'trends': 4.0,
+        'chart': 5.0,
+    }
+    # Handlers that may hit the upstream API or burn CPU
+    EXPENSIVE_COMMANDS = {'rates', 'convert', 'trends', 'chart'}
+    MAX_EXPENSIVE_CONCURRENCY = 8
+    MAX_TRACKED_USERS = 10_000
+
+    def __init__(self):
+        self._buckets: Dict[int, TokenBucket] = {}
+        self._active_expensive = 0
+        self.allowed = Counter()
+        self.throttled = Counter()
+        self.busy = Counter()
+
+    def wrap(self, callback: Callable, command: Optional[str] = None) -> Callable:
+        """Wrap a handler callback; callbacks without a command are named by their query data"""
+
+        @wraps(callback)
+        async def throttled_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+            name = command or self._get_callback_command(update)
+            user_id = self._get_user_id(update)
+            cost = self.COMMAND_COSTS.get(name, self.DEFAULT_COST)
+
+            wait = self._take(user_id, cost) if user_id is not None else 0.0
+            if wait:
+                self.throttled[name] += 1
+                bucket = self._buckets[user_id]
+                if not bucket.notified:
+                    bucket.notified = True
+                    await self._reject(update, f"⏳ You're sending requests too quickly. "
+                                               f"Please wait {wait:.0f}s and try again.")
+                elif update.callback_query:
+                    await update.callback_query.answer()
+                return
+
+            expensive = name in self.EXPENSIVE_COMMANDS
+            if expensive and self._active_expensive >= self.MAX_EXPENSIVE_CONCURRENCY:
+                self.busy[name] += 1
+                # Nothing ran, so the user keeps their tokens for the retry
+                if user_id is not None:
+                    self._refund(user_id, cost)
+                await self._reject(update, "🚦 The bot is busy right now. Please try again in a moment.")
+                return
+
+            self.allowed[name] += 1
+            if not expensive:
+                return await callback(update, context)
+
+            self._active_expensive += 1
+            try:
+                return await callback(update, context)
+            finally:
+                self._active_expensive -= 1
+
+        return throttled_callback
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        """Get allowed, throttled and busy-rejected counts per command"""
+        commands = set(self.allowed) | set(self.throttled) | set(self.busy)
+        return {
+            name: {
+                'allowed': self.allowed[name],
+                'throttled': self.throttled[name],
+                'busy': self.busy[name]
+            }
+            for name in sorted(commands)
+        }
+
+    async def log_metrics(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Job callback logging throttling metrics when anything was rejected"""
+        if self.throttled or self.busy:
+            logger.info(f"Throttle metrics: {self.metrics()}")
+
+    def _take(self, user_id: int, cost: float) -> float:
+        """Take cost tokens from a user's bucket, returning seconds to wait if it is too empty"""
+        now = time.monotonic()
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_TRACKED_USERS:
+                self._prune(now)
+            bucket = self._buckets[user_id] = TokenBucket(self.BUCKET_CAPACITY, now)
+        else:
+            bucket.refill(self.BUCKET_CAPACITY, self.REFILL_PER_SECOND, now)
+
+        if bucket.tokens < cost:
+            return max(1.0, (cost - bucket.tokens) / self.REFILL_PER_SECOND)
+        bucket.tokens -= cost
+        bucket.notified = False
+        return 0.0
+
+    def _refund(self, user_id: int, cost: float) -> None:
+        """Return tokens taken for a request that was rejected before running"""
+        bucket = self._buckets.get(user_id)
+        if bucket is not None:
+            bucket.tokens = min(self.BUCKET_CAPACITY, bucket.tokens + cost)
+
+    def _prune(self, now: float) -> None:
+        """Forget users whose buckets have refilled completely"""
+        full_after = self.BUCKET_CAPACITY / self.REFILL_PER_SECOND
+        idle = [user_id for user_id, bucket in self._buckets.items() if now - bucket.updated >= full_after]
+        for user_id in idle:
+            del self._buckets[user_id]
+
+    @staticmethod
+    def _get_callback_command(update: Update) -> str:
+        """Name a callback query by the command part of its data"""
+        query = update.callback_query
+        if query and query.data:
+            return query.data.split(':', 1)[0]
+        return 'unknown'
+
+    @staticmethod
+    def _get_user_id(update: Update) -> Optional[int]:
+        """Identify who a request should be charged to"""
+        if update.effective_user:
+            return update.effective_user.id
+        if update.effective_chat:
+            return update.effective_chat.id
+        return None
+
+    @staticmethod
+    async def _reject(update: Update, message: str) -> None:
+        """Tell the user their request was not processed"""
+        if update.callback_query:
+            await update.callback_query.answer(message)
+        elif update.effective_message:
+            await update.effective_message.reply_text(message)
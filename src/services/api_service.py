@@ -1,50 +1,188 @@
 """
 API service module for handling external API calls.
 This module contains the APIService class that handles all
-interactions with the currency exchange rate API.
+interactions with the currency exchange rate API, merging current
+rates from the configured rate providers.
 """
 
-import requests
+import asyncio
+import contextvars
+import functools
 import logging
-from typing import Dict, Optional
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from ..utils.tracing import tracer
+from . import rate_providers
+from .rate_aggregator import RateAggregator
+from .rate_providers import FawazProvider, RateProvider, build_providers
+from .snapshot_store import SnapshotStore
 
 logger = logging.getLogger(__name__)
 
 
 class APIService:
     """Service class for handling API calls"""
-    
-    BASE_URL = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies"
-    
-    @staticmethod
-    async def get_current_rates() -> Optional[Dict]:
-        """Get current USD exchange rates"""
-        try:
-            response = requests.get(f"{APIService.BASE_URL}/usd.json")
-            if response.status_code == 200:
-                return response.json()
-            logger.warning(f"API returned status code: {response.status_code}")
-            return None
-        except requests.RequestException as e:
-            logger.error(f"Error fetching current rates: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error fetching current rates: {e}")
-            return None
-    
-    @staticmethod
-    async def get_historical_rates(date: str) -> Optional[Dict]:
+
+    HISTORICAL_URL = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@{date}/v1/currencies/usd.json"
+    CACHE_TTL = 900
+    RATE_PROVIDERS = "fawaz,erapi"
+    # HISTORICAL_URL archives this provider's dataset, so changes over time are measured within it
+    ARCHIVE_SOURCE = FawazProvider.name
+    ARCHIVE_LABEL = FawazProvider.label
+    # Archive downloads get their own small pool so a cold chart cannot starve the default executor
+    HISTORY_WORKERS = 4
+
+    def __init__(self, snapshot_store: Optional[SnapshotStore] = None,
+                 providers: Optional[List[RateProvider]] = None):
+        self.snapshot_store = snapshot_store
+        # Read at construction rather than import, so settings loaded from .env by main() apply
+        self.cache_ttl = int(os.getenv("RATES_CACHE_TTL", self.CACHE_TTL))
+        self.rate_aggregator = RateAggregator(
+            providers or build_providers(os.getenv("RATE_PROVIDERS", self.RATE_PROVIDERS))
+        )
+        self._current: Optional[Dict] = None
+        self._current_fetched_at = 0.0
+        self._current_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Published snapshots for past dates never change, so they are kept for the process lifetime
+        self._historical_cache: Dict[str, Dict] = {}
+        # In-flight archive downloads, shared by concurrent requests for the same date
+        self._historical_pending: Dict[str, asyncio.Future] = {}
+        self._history_executor = ThreadPoolExecutor(
+            max_workers=self.HISTORY_WORKERS, thread_name_prefix="history"
+        )
+
+    def load_snapshots(self) -> int:
+        """Seed the caches from the snapshot store, returning the number of snapshots loaded"""
+        if not self.snapshot_store:
+            return 0
+
+        state = self.snapshot_store.load()
+        self._historical_cache.update(state['history'])
+        if state['current'] and state['fetched_at'] > self._current_fetched_at:
+            self._current = state['current']
+            self._current_fetched_at = state['fetched_at']
+        return len(state['history']) + (1 if state['current'] else 0)
+
+    def has_fresh_rates(self) -> bool:
+        """Check whether the cached current rates are within the cache TTL"""
+        return self._current is not None and time.time() - self._current_fetched_at < self.cache_ttl
+
+    async def get_current_rates(self) -> Optional[Dict]:
+        """Get current USD exchange rates, serving stale rates while they refresh in the background"""
+        if self.has_fresh_rates():
+            return self._current
+        if self._current is not None:
+            self.refresh_in_background()
+            return self._current
+
+        with tracer.span("api.current_rates"):
+            return await self._refresh_current_rates()
+
+    def refresh_in_background(self) -> asyncio.Task:
+        """Start refreshing current rates unless a refresh is already running"""
+        if self._refresh_task is None or self._refresh_task.done():
+            # A fresh context detaches the refresh from the trace of whichever request started it
+            self._refresh_task = asyncio.create_task(self._background_refresh(), context=contextvars.Context())
+        return self._refresh_task
+
+    async def _background_refresh(self) -> Optional[Dict]:
+        """Refresh current rates as a trace of its own"""
+        with tracer.start_trace("api.background_refresh"):
+            return await self._refresh_current_rates()
+
+    async def _refresh_current_rates(self) -> Optional[Dict]:
+        """Fetch current rates unless a concurrent refresh already did"""
+        # Only one coroutine refreshes; the rest wait and reuse its result
+        async with self._current_lock:
+            if self.has_fresh_rates():
+                return self._current
+
+            data = await self.rate_aggregator.fetch()
+            if data and data.get('usd'):
+                self._current = data
+                self._current_fetched_at = time.time()
+                await self._persist()
+            elif self._current:
+                logger.warning("Serving stale current rates after failed refresh")
+            return self._current
+
+    def get_archive_baseline(self, current_data: Dict) -> Optional[Dict]:
+        """Get today's rates from the archived dataset, so changes against history compare like with like"""
+        sources = current_data.get('sources')
+        if sources is None:
+            # Snapshots without provenance came from the archived dataset alone
+            baseline = None if current_data.get('provenance') else current_data
+        else:
+            baseline = sources.get(self.ARCHIVE_SOURCE)
+        return {'label': self.ARCHIVE_LABEL, **baseline} if baseline else None
+
+    async def get_historical_rates(self, date: str) -> Optional[Dict]:
         """Get historical USD exchange rates for a specific date"""
-        try:
-            url = f"https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@{date}/v1/currencies/usd.json"
-            response = requests.get(url)
-            if response.status_code == 200:
-                return response.json()
-            logger.warning(f"Historical API returned status code: {response.status_code} for date: {date}")
-            return None
-        except requests.RequestException as e:
-            logger.error(f"Error fetching historical rates for {date}: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error fetching historical rates for {date}: {e}")
-            return None
+        if date in self._historical_cache:
+            return self._historical_cache[date]
+
+        with tracer.span("api.historical_rates", date=date):
+            data = await self._fetch_historical(date)
+            if data:
+                await self._persist()
+            return data
+
+    async def get_history(self, end_date: str, days: int, points: int) -> List[Dict]:
+        """Get up to `points` USD snapshots evenly spread over `days` ending at `end_date`"""
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        # Offsets are picked by index so at most `points` dates, and so fetches, are requested
+        count = max(1, min(points, days + 1))
+        offsets = {round(index * days / max(1, count - 1)) for index in range(count)}
+        dates = sorted((end - timedelta(days=offset)).strftime('%Y-%m-%d') for offset in offsets)
+
+        missing = [date for date in dates if date not in self._historical_cache]
+        if missing:
+            with tracer.span("api.history", dates=len(missing)):
+                await asyncio.gather(*(self._fetch_historical(date) for date in missing))
+                await self._persist()
+
+        return [self._historical_cache[date] for date in dates if date in self._historical_cache]
+
+    async def _fetch_historical(self, date: str) -> Optional[Dict]:
+        """Fetch one archived snapshot into the cache, joining any download of the same date in flight"""
+        pending = self._historical_pending.get(date)
+        if pending is None:
+            pending = asyncio.ensure_future(self._download_historical(date))
+            self._historical_pending[date] = pending
+            pending.add_done_callback(lambda _: self._historical_pending.pop(date, None))
+        # Shielded so one cancelled request does not abort the download for the others
+        return await asyncio.shield(pending)
+
+    async def _download_historical(self, date: str) -> Optional[Dict]:
+        """Download an archived snapshot on the history pool"""
+        fetch = functools.partial(
+            rate_providers.fetch_json, self.HISTORICAL_URL.format(date=date), f"historical rates for {date}"
+        )
+        # Run in a copy of the current context so the http.get span joins the request's trace
+        data = await asyncio.get_running_loop().run_in_executor(
+            self._history_executor, contextvars.copy_context().run, fetch
+        )
+        if data and data.get('usd'):
+            self._historical_cache[date] = data
+            return data
+        return None
+
+    def shutdown(self) -> None:
+        """Stop the history download pool"""
+        self._history_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _persist(self) -> None:
+        """Write the current caches to the snapshot store without blocking the event loop"""
+        if self.snapshot_store:
+            with tracer.span("snapshot.persist"):
+                await asyncio.to_thread(
+                    self.snapshot_store.save,
+                    self._current,
+                    self._current_fetched_at,
+                    dict(self._historical_cache)
+                )
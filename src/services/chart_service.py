@@ -0,0 +1,135 @@
+"""
+Chart service module for rendering and caching trend charts.
+This module contains the ChartService class that turns historical
+rates into PNG charts, rendering them in a process pool and caching
+the result (and its Telegram file_id) per currency, window and snapshot.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from ..utils.chart_renderer import render_line_chart
+from ..utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+ChartKey = Tuple[str, int, str]
+
+
+class ChartService:
+    """Service class for producing trend charts"""
+
+    MIN_DAYS = 7
+    MAX_DAYS = 90
+    DEFAULT_DAYS = 30
+    MAX_POINTS = 31
+    MAX_CACHE_ENTRIES = 256
+
+    def __init__(self, api_service, max_workers: int = 2):
+        self.api_service = api_service
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[ChartKey, Dict]" = OrderedDict()
+        self._pending: Dict[ChartKey, asyncio.Future] = {}
+        self.stats = {'hits': 0, 'renders': 0, 'uploads_saved': 0}
+
+    async def get_chart(self, currency: str, days: int) -> Dict:
+        """Get a chart entry for currency over the last `days` days"""
+        current_data = await self.api_service.get_current_rates()
+        if not current_data or not current_data.get('date'):
+            return {'error': True, 'message': "❌ Sorry, I couldn't fetch chart data. Please try again later."}
+
+        key = (currency, days, current_data['date'])
+        entry = self._cache.get(key)
+        if entry:
+            self._cache.move_to_end(key)
+            self.stats['hits'] += 1
+            if entry['file_id']:
+                self.stats['uploads_saved'] += 1
+            return entry
+
+        # Coalesce concurrent requests for the same chart into one render
+        pending = self._pending.get(key)
+        if pending:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leader was cancelled; take over the render unless this request was cancelled too
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self.get_chart(currency, days)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            entry = await self._build_entry(key)
+            future.set_result(entry)
+            return entry
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so a future nobody awaited is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+            # A cancelled leader (CancelledError is not an Exception) must not leave followers waiting
+            if not future.done():
+                future.cancel()
+
+    def remember_file_id(self, key: ChartKey, file_id: str) -> None:
+        """Store the Telegram file_id of an uploaded chart so it is never uploaded again"""
+        entry = self._cache.get(key)
+        if entry:
+            entry['file_id'] = file_id
+
+    def shutdown(self) -> None:
+        """Stop the rendering process pool"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _build_entry(self, key: ChartKey) -> Dict:
+        """Fetch the history for key and render its chart"""
+        currency, days, date = key
+        history = await self.api_service.get_history(date, days, self.MAX_POINTS)
+        values = [snapshot['usd'][currency] for snapshot in history if currency in snapshot.get('usd', {})]
+        if len(values) < 2:
+            return {'error': True, 'message': "❌ Historical data temporarily unavailable."}
+
+        loop = asyncio.get_running_loop()
+        with tracer.span("chart.render", points=len(values)):
+            png = await loop.run_in_executor(self._get_executor(), render_line_chart, values)
+        self.stats['renders'] += 1
+
+        entry = {
+            'error': False,
+            'key': key,
+            'png': png,
+            'file_id': None,
+            'currency': currency,
+            'days': days,
+            'start_date': history[0]['date'],
+            'end_date': history[-1]['date'],
+            'first': values[0],
+            'last': values[-1],
+            'low': min(values),
+            'high': max(values),
+        }
+        self._cache[key] = entry
+        if len(self._cache) > self.MAX_CACHE_ENTRIES:
+            self._cache.popitem(last=False)
+        return entry
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use"""
+        if self._executor is None:
+            # The bot is multi-threaded by now, so workers must not be forked from it
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context(start_method)
+            )
+        return self._executor
@@ -0,0 +1,91 @@
+"""
+Conversion engine module for exact currency conversion.
+This module contains the ConversionEngine class that converts amounts
+with decimal arithmetic. Rates are converted to Decimal once per
+snapshot and cross rates are cached, so exactness costs little.
+"""
+
+from decimal import ROUND_HALF_UP, Context, Decimal
+from typing import Dict, Optional, Tuple
+
+from ..data.currency_data import CurrencyData
+
+
+class ConversionEngine:
+    """Class for converting amounts between currencies with Decimal arithmetic"""
+
+    # Source rates carry at most 17 significant digits, so 20 keeps cross rates exact enough
+    RATE_CONTEXT = Context(prec=20)
+    # Non-zero amounts that would round to zero keep this many places instead
+    SMALL_AMOUNT_PLACES = 4
+    MAX_AMOUNT = Decimal("1e15")
+    # User input is shown unrounded, so its precision is bounded to keep replies short
+    MAX_FRACTION_DIGITS = 8
+    MAX_SIGNIFICANT_DIGITS = 20
+
+    def __init__(self):
+        self._snapshot: Optional[Dict] = None
+        self._rates: Dict[str, Decimal] = {}
+        self._cross_rates: Dict[Tuple[str, str], Optional[Decimal]] = {}
+        self._steps: Dict[str, Tuple[Decimal, Decimal]] = {}
+
+    def get_rate(self, data: Dict, from_currency: str, to_currency: str) -> Optional[Decimal]:
+        """Get how many units of to_currency one unit of from_currency buys"""
+        if data is not self._snapshot:
+            self._load_snapshot(data)
+
+        key = (from_currency, to_currency)
+        if key not in self._cross_rates:
+            from_rate = self._rates.get(from_currency)
+            to_rate = self._rates.get(to_currency)
+            rate = None
+            if from_rate and to_rate is not None:
+                rate = self.RATE_CONTEXT.divide(to_rate, from_rate)
+            self._cross_rates[key] = rate
+        return self._cross_rates[key]
+
+    def convert(self, amount: Decimal, from_currency: str, to_currency: str, data: Dict) -> Optional[Decimal]:
+        """Convert amount and round it to the target currency's minor unit"""
+        rate = self.get_rate(data, from_currency, to_currency)
+        if rate is None:
+            return None
+        return self.round_amount(amount * rate, to_currency)
+
+    def round_amount(self, amount: Decimal, currency: str) -> Decimal:
+        """Round an amount to the currency's minor unit, keeping extra places only if it would vanish"""
+        step, small_step = self._get_steps(currency)
+        rounded = amount.quantize(step, rounding=ROUND_HALF_UP)
+        if rounded.is_zero() and not amount.is_zero():
+            return amount.quantize(small_step, rounding=ROUND_HALF_UP)
+        return rounded
+
+    def pad_amount(self, amount: Decimal, currency: str) -> Decimal:
+        """Show a user-entered amount with at least the currency's minor unit, never rounding it"""
+        step, _ = self._get_steps(currency)
+        if amount.as_tuple().exponent > step.as_tuple().exponent:
+            return amount.quantize(step)
+        return amount
+
+    def _get_steps(self, currency: str) -> Tuple[Decimal, Decimal]:
+        """Get the minor-unit rounding step and the finer step for tiny amounts"""
+        steps = self._steps.get(currency)
+        if steps is None:
+            places = CurrencyData.get_minor_units(currency)
+            steps = self._steps[currency] = (
+                Decimal(1).scaleb(-places),
+                Decimal(1).scaleb(-max(places, self.SMALL_AMOUNT_PLACES))
+            )
+        return steps
+
+    def _load_snapshot(self, data: Dict) -> None:
+        """Convert a snapshot's USD rates to Decimal once and reset cached cross rates"""
+        usd_rates = data.get('usd', {})
+        # str() keeps the shortest decimal form of the published rate rather than its binary expansion
+        self._rates = {
+            code: Decimal(str(usd_rates[code]))
+            for code in CurrencyData.CURRENCIES
+            if usd_rates.get(code) is not None
+        }
+        self._rates['usd'] = Decimal(1)
+        self._cross_rates = {}
+        self._snapshot = data
@@ -0,0 +1,221 @@
+"""
+Digest service module for daily digest broadcasts.
+This module contains the DigestService class that renders each distinct
+digest once and fans it out to subscribers in rate-limited batches,
+checkpointing progress so an interrupted broadcast can resume.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, time as dt_time, timedelta
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from telegram.error import Forbidden, RetryAfter, TelegramError
+
+from ..data.currency_data import CurrencyData
+from ..utils.formatter import MessageFormatter
+from .subscription_store import SubscriptionStore
+
+logger = logging.getLogger(__name__)
+
+
+class DigestService:
+    """Service class for daily digest broadcasts"""
+
+    DIGEST_TIME = "08:00"
+    DIGEST_TIMEZONE = "Asia/Phnom_Penh"
+    MAX_PAIRS = 5
+    # Telegram allows roughly 30 messages per second per bot; stay safely below it
+    MESSAGES_PER_SECOND = 25
+    BATCH_SIZE = 25
+    # A run's lease is renewed every batch; a crashed owner's lease lapses after this long
+    LEASE_SECONDS = 120
+
+    def __init__(self, api_service, subscription_store: SubscriptionStore):
+        self.api_service = api_service
+        self.subscription_store = subscription_store
+        self.formatter = MessageFormatter()
+        # Read at construction rather than import, so settings loaded from .env by main() apply
+        self.digest_time = os.getenv("DIGEST_TIME", self.DIGEST_TIME)
+        self.digest_timezone = os.getenv("DIGEST_TIMEZONE", self.DIGEST_TIMEZONE)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._active_runs = set()
+
+    def get_schedule_time(self) -> dt_time:
+        """Get the daily send time in the digest timezone"""
+        hour, minute = (int(part) for part in self.digest_time.split(":", 1))
+        return dt_time(hour, minute, tzinfo=ZoneInfo(self.digest_timezone))
+
+    def get_run_id(self) -> str:
+        """Get the id of today's broadcast in the digest timezone"""
+        return datetime.now(ZoneInfo(self.digest_timezone)).strftime('%Y-%m-%d')
+
+    async def broadcast(self, bot, run_id: str) -> Dict:
+        """Send the digest for run_id to every subscriber not yet reached by that run
+
+        The checkpoint is advanced before each batch is sent, so a crash can
+        drop at most one batch but never sends anyone the same digest twice.
+        Only one broadcast may hold a run: concurrent calls in this process
+        and other processes holding the run's lease are skipped, with
+        stats['skipped'] set to 'running' or 'leased'.
+        """
+        stats = {'sent': 0, 'failed': 0, 'unsubscribed': 0, 'digests': 0}
+
+        # No await between the check and the add, so two coroutines cannot both pass
+        if run_id in self._active_runs:
+            logger.info(f"Digest {run_id} is already being broadcast by this process")
+            stats['skipped'] = 'running'
+            return stats
+        self._active_runs.add(run_id)
+        try:
+            return await self._broadcast(bot, run_id, stats)
+        finally:
+            self._active_runs.discard(run_id)
+            await asyncio.to_thread(self.subscription_store.release_run, run_id, self.owner)
+
+    async def _broadcast(self, bot, run_id: str, stats: Dict) -> Dict:
+        """Claim run_id and send its remaining batches"""
+        store = self.subscription_store
+
+        claimed = await asyncio.to_thread(store.claim_run, run_id, self.owner, self.LEASE_SECONDS)
+        after, finished = await asyncio.to_thread(store.get_checkpoint, run_id)
+        if finished:
+            return stats
+        if not claimed:
+            logger.info(f"Digest {run_id} is leased by another process")
+            stats['skipped'] = 'leased'
+            return stats
+
+        current_data = await self.api_service.get_current_rates()
+        if not current_data:
+            logger.error(f"Digest {run_id} postponed: current rates unavailable")
+            return stats
+        # Changes are measured within the archived dataset, never across providers
+        baseline_data = self.api_service.get_archive_baseline(current_data)
+        previous_data = None
+        if baseline_data:
+            previous_data = await self.api_service.get_historical_rates(self._previous_date(baseline_data.get('date')))
+
+        # Subscribers arrive grouped by pairs, so only the current group's text is held
+        group_pairs, group_text = None, ""
+        if after[0]:
+            logger.info(f"Resuming digest {run_id} after chat {after[1]}")
+
+        while True:
+            batch_started = time.monotonic()
+            batch = await asyncio.to_thread(store.fetch_batch, after, self.BATCH_SIZE)
+            if not batch:
+                break
+            after = batch[-1]
+            if not await asyncio.to_thread(store.save_checkpoint, run_id, after, self.owner, self.LEASE_SECONDS):
+                logger.warning(f"Digest {run_id} lease was lost; stopping this broadcast")
+                stats['skipped'] = 'leased'
+                return stats
+
+            sends = []
+            for pairs, chat_id in batch:
+                if pairs != group_pairs:
+                    group_pairs = pairs
+                    group_text = self.build_digest_message(
+                        SubscriptionStore.decode_pairs(pairs), current_data, previous_data, baseline_data
+                    )
+                    stats['digests'] += 1
+                sends.append(self._send(bot, chat_id, group_text))
+            results = await asyncio.gather(*sends)
+
+            blocked = [chat_id for (_, chat_id), result in zip(batch, results) if result == 'blocked']
+            if blocked:
+                stats['unsubscribed'] += await asyncio.to_thread(store.unsubscribe, *blocked)
+            stats['sent'] += results.count('sent')
+            stats['failed'] += results.count('failed')
+
+            pause = len(batch) / self.MESSAGES_PER_SECOND - (time.monotonic() - batch_started)
+            await asyncio.sleep(max(0.0, pause))
+
+        await asyncio.to_thread(store.finish_run, run_id)
+        logger.info(f"Digest {run_id} finished: {stats}")
+        return stats
+
+    def build_digest_message(self, pairs: List[Tuple[str, str]], current_data: Dict,
+                             previous_data: Optional[Dict], baseline_data: Optional[Dict] = None) -> str:
+        """Build the digest message for a set of currency pairs
+
+        Rates come from current_data; changes compare baseline_data (today in
+        the archived dataset) with previous_data, so they never mix providers.
+        """
+        current_rates = current_data.get('usd', {})
+        baseline_rates = (baseline_data or {}).get('usd', {})
+        previous_rates = (previous_data or {}).get('usd', {}) if baseline_data else {}
+        provenance = current_data.get('provenance', {})
+        sources = {}
+
+        message = "☀️ **Your Daily Exchange Digest**\n"
+        message += f"📅 {current_data.get('date', 'Unknown')}\n\n"
+
+        for base, quote in pairs:
+            rate = self._cross_rate(current_rates, base, quote)
+            if rate is None:
+                message += f"**{base.upper()}/{quote.upper()}** - unavailable\n"
+                continue
+
+            line = (f"{CurrencyData.get_flag_emoji(base)}{CurrencyData.get_flag_emoji(quote)} "
+                    f"**1 {base.upper()}** = {self.formatter.format_exchange_rate(rate)} {quote.upper()}")
+            baseline_rate = self._cross_rate(baseline_rates, base, quote)
+            previous_rate = self._cross_rate(previous_rates, base, quote)
+            if baseline_rate and previous_rate:
+                change_percent = ((baseline_rate - previous_rate) / previous_rate) * 100
+                line += f" ({self.formatter.format_percentage(change_percent)})"
+            message += line + "\n"
+            for code in (base, quote):
+                if code in provenance and code != 'usd':
+                    sources[provenance[code]['source']] = provenance[code]
+
+        if sources:
+            message += "\n📡 Rates: " + " · ".join(self.formatter.format_source(source) for source in sources.values())
+            message += "\n"
+        if previous_rates:
+            message += f"\n💡 *Change vs. the previous day in the {baseline_data['label']} dataset. Use /digest off to unsubscribe*"
+        else:
+            message += "\n💡 *Use /digest off to unsubscribe*"
+        return message
+
+    async def _send(self, bot, chat_id: int, text: str) -> str:
+        """Send one digest, returning 'sent', 'blocked' or 'failed'"""
+        for _ in range(2):
+            try:
+                await bot.send_message(chat_id, text, parse_mode='Markdown')
+                return 'sent'
+            except RetryAfter as e:
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                logger.warning(f"Flood limit hit sending digest, retrying in {delay}s")
+                await asyncio.sleep(delay)
+            except Forbidden:
+                return 'blocked'
+            except TelegramError as e:
+                logger.warning(f"Could not send digest to {chat_id}: {e}")
+                return 'failed'
+        return 'failed'
+
+    @staticmethod
+    def _cross_rate(usd_rates: Dict, base: str, quote: str) -> Optional[float]:
+        """Calculate how many units of quote one unit of base buys"""
+        base_rate = 1.0 if base == 'usd' else usd_rates.get(base)
+        quote_rate = 1.0 if quote == 'usd' else usd_rates.get(quote)
+        if not base_rate or quote_rate is None:
+            return None
+        return quote_rate / base_rate
+
+    @staticmethod
+    def _previous_date(current_date: Optional[str]) -> str:
+        """Get the day before the snapshot date"""
+        try:
+            return (datetime.strptime(current_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+        except (TypeError, ValueError):
+            return (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
@@ -0,0 +1,106 @@
+"""
+Rate aggregator module for merging multiple rate providers.
+This module contains the RateAggregator class that fetches every
+provider concurrently under per-provider timeouts and a global deadline,
+then merges the snapshots per currency by freshness and priority,
+recording which provider each rate came from.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.tracing import tracer
+from .rate_providers import RateProvider
+
+logger = logging.getLogger(__name__)
+
+
+class RateAggregator:
+    """Class for fetching and merging rate snapshots from several providers"""
+
+    # The merged result is returned by this deadline even if providers are still running
+    DEADLINE = 6.0
+    # Snapshots this close to the freshest one count as equally fresh, so priority decides
+    FRESHNESS_TOLERANCE = 6 * 3600
+
+    def __init__(self, providers: List[RateProvider]):
+        if not providers:
+            raise ValueError("At least one rate provider is required")
+        self.providers = providers
+
+    async def fetch(self) -> Optional[Dict]:
+        """Fetch all providers and merge whatever arrived before the deadline"""
+        tasks = [asyncio.create_task(self._fetch_provider(provider)) for provider in self.providers]
+        done, pending = await asyncio.wait(tasks, timeout=self.DEADLINE)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"{len(pending)} rate provider(s) missed the {self.DEADLINE}s deadline")
+
+        # Keep provider order so index doubles as priority
+        snapshots = [
+            (priority, provider, task.result())
+            for priority, (provider, task) in enumerate(zip(self.providers, tasks))
+            if task in done and task.result()
+        ]
+        return self.merge(snapshots)
+
+    def merge(self, snapshots: List[Tuple[int, RateProvider, Dict]]) -> Optional[Dict]:
+        """Pick each currency's rate from the freshest snapshot, preferring higher priority among near-ties"""
+        if not snapshots:
+            return None
+
+        candidates: Dict[str, List[Tuple[float, int, RateProvider, Dict]]] = {}
+        for priority, provider, snapshot in snapshots:
+            for code in snapshot['usd']:
+                candidates.setdefault(code, []).append((snapshot['timestamp'], priority, provider, snapshot))
+
+        usd_rates = {}
+        provenance = {}
+        used = set()
+        for code, options in candidates.items():
+            freshest = max(timestamp for timestamp, _, _, _ in options)
+            timestamp, priority, provider, snapshot = min(
+                (option for option in options if option[0] >= freshest - self.FRESHNESS_TOLERANCE),
+                key=lambda option: option[1]
+            )
+            usd_rates[code] = snapshot['usd'][code]
+            provenance[code] = {
+                'source': provider.name,
+                'label': provider.label,
+                'timestamp': timestamp,
+                'date_only': snapshot.get('date_only', False)
+            }
+            used.add(priority)
+
+        contributing = [snapshot for priority, _, snapshot in snapshots if priority in used]
+        return {
+            'date': max(snapshot['date'] for snapshot in contributing),
+            'usd': usd_rates,
+            'provenance': provenance,
+            # Each provider's own rates, for comparisons that must stay within one dataset
+            'sources': {
+                provider.name: {'label': provider.label, 'date': snapshot['date'], 'usd': snapshot['usd']}
+                for _, provider, snapshot in snapshots
+            }
+        }
+
+    @staticmethod
+    async def _fetch_provider(provider: RateProvider) -> Optional[Dict]:
+        """Fetch one provider within its own timeout, never raising"""
+        with tracer.span(f"provider.{provider.name}") as span:
+            try:
+                snapshot = await asyncio.wait_for(provider.fetch(), provider.TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Rate provider {provider.name} timed out after {provider.TIMEOUT}s")
+                span.set_attribute('timeout', True)
+                return None
+            except Exception as e:
+                logger.error(f"Rate provider {provider.name} failed: {e}")
+                return None
+
+            if not snapshot or not snapshot.get('usd'):
+                return None
+            span.set_attribute('currencies', len(snapshot['usd']))
+            return snapshot
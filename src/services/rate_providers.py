@@ -0,0 +1,197 @@
+"""
+Rate provider module for pluggable exchange rate sources.
+This module contains the RateProvider base class and its implementations.
+Every provider returns a normalized snapshot of USD-based rates stamped
+with the time the rates were valid, so snapshots from different sources
+can be merged by freshness.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from ..data.currency_data import CurrencyData
+from ..utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 10
+
+
+def fetch_json(url: str, description: str, timeout: float = REQUEST_TIMEOUT) -> Optional[Dict]:
+    """Blocking GET of a JSON document, run in a worker thread"""
+    # Deferred so startup from a persisted snapshot never pays for importing requests
+    import requests
+
+    try:
+        with tracer.span("http.get", url=url) as span:
+            response = requests.get(url, timeout=timeout)
+            span.set_attribute('http.status_code', response.status_code)
+        if response.status_code == 200:
+            return response.json()
+        logger.warning(f"API returned status code: {response.status_code} for {description}")
+        return None
+    except requests.RequestException as e:
+        logger.error(f"Error fetching {description}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error fetching {description}: {e}")
+        return None
+
+
+def _date_timestamp(date: str) -> float:
+    """Get the UTC midnight timestamp of a YYYY-MM-DD date"""
+    return datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp()
+
+
+class RateProvider(ABC):
+    """Base class for exchange rate sources
+
+    Subclasses implement fetch_snapshot (blocking, run in a worker thread)
+    and may override fetch, finishing within TIMEOUT. A snapshot is
+    {'date', 'timestamp', 'date_only', 'usd'} where 'usd' maps lowercase
+    currency codes to units per 1 USD and 'date_only' marks sources that
+    publish a date but no time of day.
+    """
+
+    name = "base"
+    label = "Base"
+    TIMEOUT = 5.0
+
+    async def fetch(self) -> Optional[Dict]:
+        """Get the provider's latest snapshot"""
+        return await asyncio.to_thread(self.fetch_snapshot)
+
+    @abstractmethod
+    def fetch_snapshot(self) -> Optional[Dict]:
+        """Blocking fetch of the latest snapshot"""
+
+    @staticmethod
+    def _supported_rates(rates: Dict) -> Dict[str, float]:
+        """Keep numeric rates for supported currencies, keyed by lowercase code"""
+        supported = {}
+        for code, rate in rates.items():
+            code = code.lower()
+            if code in CurrencyData.CURRENCIES and isinstance(rate, (int, float)) and rate > 0:
+                supported[code] = float(rate)
+        return supported
+
+
+class FawazProvider(RateProvider):
+    """fawazahmed0 currency-api, published once a day on jsDelivr with a Cloudflare mirror"""
+
+    name = "fawaz"
+    label = "Currency API"
+    URLS = [
+        "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json",
+        "https://latest.currency-api.pages.dev/v1/currencies/usd.json",
+    ]
+
+    def fetch_snapshot(self) -> Optional[Dict]:
+        # Split the budget so a hanging CDN still leaves time for the mirror
+        timeout = self.TIMEOUT / len(self.URLS)
+        for url in self.URLS:
+            data = fetch_json(url, "current rates", timeout)
+            if data and data.get('usd') and data.get('date'):
+                return {
+                    'date': data['date'],
+                    'timestamp': _date_timestamp(data['date']),
+                    'date_only': True,
+                    'usd': self._supported_rates(data['usd'])
+                }
+        return None
+
+
+class ExchangeRateApiProvider(RateProvider):
+    """open.er-api.com free endpoint, refreshed daily with an exact update time"""
+
+    name = "erapi"
+    label = "ExchangeRate-API"
+    URL = "https://open.er-api.com/v6/latest/USD"
+
+    def fetch_snapshot(self) -> Optional[Dict]:
+        data = fetch_json(self.URL, "ExchangeRate-API rates", self.TIMEOUT)
+        if not data or data.get('result') != 'success' or not data.get('rates'):
+            return None
+        timestamp = float(data.get('time_last_update_unix') or time.time())
+        return {
+            'date': datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d'),
+            'timestamp': timestamp,
+            'date_only': False,
+            'usd': self._supported_rates(data['rates'])
+        }
+
+
+class LocalFileProvider(RateProvider):
+    """Rates read from a local JSON file in the currency-api format, for testing or manual overrides"""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.label = "Local file"
+
+    def fetch_snapshot(self) -> Optional[Dict]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read rates file {self.path}: {e}")
+            return None
+
+        date = data.get('date') or time.strftime('%Y-%m-%d', time.gmtime())
+        return {
+            'date': date,
+            'timestamp': float(data.get('timestamp') or _date_timestamp(date)),
+            'date_only': not data.get('timestamp'),
+            'usd': self._supported_rates(data.get('usd', {}))
+        }
+
+
+class StubProvider(RateProvider):
+    """In-memory provider with optional artificial delay, for tests and benchmarks"""
+
+    def __init__(self, name: str, rates: Dict[str, float], timestamp: Optional[float] = None,
+                 delay: float = 0.0, label: Optional[str] = None):
+        self.name = name
+        self.label = label or name
+        self.rates = rates
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.delay = delay
+
+    async def fetch(self) -> Optional[Dict]:
+        # Sleeping on the event loop keeps a cancelled slow stub from holding a worker thread
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.fetch_snapshot()
+
+    def fetch_snapshot(self) -> Optional[Dict]:
+        return {
+            'date': datetime.fromtimestamp(self.timestamp, timezone.utc).strftime('%Y-%m-%d'),
+            'timestamp': self.timestamp,
+            'date_only': False,
+            'usd': dict(self.rates)
+        }
+
+
+def build_providers(spec: str) -> List[RateProvider]:
+    """Build providers from a comma-separated spec such as 'fawaz,erapi,file:rates.json'
+
+    Order sets priority: earlier providers win when snapshots are equally fresh.
+    """
+    providers: List[RateProvider] = []
+    for entry in (part.strip() for part in spec.split(',')):
+        kind, _, argument = entry.partition(':')
+        if kind == FawazProvider.name:
+            providers.append(FawazProvider())
+        elif kind == ExchangeRateApiProvider.name:
+            providers.append(ExchangeRateApiProvider())
+        elif kind == LocalFileProvider.name and argument:
+            providers.append(LocalFileProvider(argument))
+        elif entry:
+            raise ValueError(f"Unknown rate provider: {entry}")
+    return providers
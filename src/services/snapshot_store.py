@@ -0,0 +1,83 @@
+"""
+Snapshot store module for persisting exchange rate snapshots.
+This module contains the SnapshotStore class that keeps the latest
+rate snapshot and recent historical snapshots on disk so a restarted
+bot can answer from memory before its first upstream fetch completes.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from ..data.currency_data import CurrencyData
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """Class for loading and saving rate snapshots as JSON"""
+
+    FILENAME = "snapshots.json"
+    MAX_HISTORY = 120
+
+    def __init__(self, data_dir: str):
+        self.path = os.path.join(data_dir, self.FILENAME)
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict:
+        """Load persisted snapshots, returning empty state if none exist"""
+        empty = {'current': None, 'fetched_at': 0.0, 'history': {}}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return empty
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot file {self.path}: {e}")
+            return empty
+
+        return {
+            'current': state.get('current'),
+            'fetched_at': float(state.get('fetched_at', 0.0)),
+            'history': state.get('history', {})
+        }
+
+    def save(self, current: Optional[Dict], fetched_at: float, history: Dict[str, Dict]) -> None:
+        """Atomically write the given snapshots, keeping only supported currencies"""
+        recent_dates = sorted(history)[-self.MAX_HISTORY:]
+        state = {
+            'current': self._trim(current) if current else None,
+            'fetched_at': fetched_at,
+            'history': {date: self._trim(history[date]) for date in recent_dates}
+        }
+
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not persist snapshots to {self.path}: {e}")
+
+    @staticmethod
+    def _trim(snapshot: Dict) -> Dict:
+        """Drop currencies the bot never displays to keep the file small"""
+        usd_rates = snapshot.get('usd', {})
+        trimmed = {
+            'date': snapshot.get('date'),
+            'usd': {code: usd_rates[code] for code in CurrencyData.CURRENCIES if code in usd_rates}
+        }
+        if snapshot.get('provenance'):
+            trimmed['provenance'] = {
+                code: source for code, source in snapshot['provenance'].items() if code in trimmed['usd']
+            }
+        if snapshot.get('sources'):
+            trimmed['sources'] = {
+                name: {**source, 'usd': {code: rate for code, rate in source['usd'].items() if code in CurrencyData.CURRENCIES}}
+                for name, source in snapshot['sources'].items()
+            }
+        return trimmed
@@ -0,0 +1,149 @@
+"""
+Subscription store module for daily digest preferences.
+This module contains the SubscriptionStore class that keeps digest
+subscriptions and broadcast checkpoints in SQLite, so fan-out can page
+through subscribers without loading them all into memory.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# (pairs, chat_id) — the keyset a broadcast pages through
+Subscriber = Tuple[str, int]
+
+
+class SubscriptionStore:
+    """Class for persisting digest subscriptions and broadcast progress"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            # WAL keeps the per-batch checkpoint commits cheap during a broadcast
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS subscriptions (
+                    chat_id INTEGER PRIMARY KEY,
+                    pairs TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS subscriptions_by_pairs ON subscriptions (pairs, chat_id);
+                CREATE TABLE IF NOT EXISTS digest_runs (
+                    run_id TEXT PRIMARY KEY,
+                    last_pairs TEXT NOT NULL DEFAULT '',
+                    last_chat_id INTEGER NOT NULL DEFAULT 0,
+                    finished INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    lease_until REAL NOT NULL DEFAULT 0
+                );
+            """)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(digest_runs)")}
+            if 'owner' not in columns:
+                self._conn.execute("ALTER TABLE digest_runs ADD COLUMN owner TEXT")
+                self._conn.execute("ALTER TABLE digest_runs ADD COLUMN lease_until REAL NOT NULL DEFAULT 0")
+
+    @staticmethod
+    def encode_pairs(pairs: List[Tuple[str, str]]) -> str:
+        """Encode pairs canonically so identical digests share one key"""
+        return ",".join(sorted({f"{base}-{quote}" for base, quote in pairs}))
+
+    @staticmethod
+    def decode_pairs(encoded: str) -> List[Tuple[str, str]]:
+        """Decode pairs stored by encode_pairs"""
+        return [tuple(pair.split("-", 1)) for pair in encoded.split(",") if pair]
+
+    def subscribe(self, chat_id: int, pairs: List[Tuple[str, str]]) -> None:
+        """Create or replace the digest subscription for a chat"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO subscriptions (chat_id, pairs) VALUES (?, ?)",
+                (chat_id, self.encode_pairs(pairs))
+            )
+
+    def unsubscribe(self, *chat_ids: int) -> int:
+        """Remove digest subscriptions, returning how many were removed"""
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM subscriptions WHERE chat_id = ?",
+                [(chat_id,) for chat_id in chat_ids]
+            )
+            return cursor.rowcount
+
+    def get_pairs(self, chat_id: int) -> List[Tuple[str, str]]:
+        """Get the subscribed pairs for a chat"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pairs FROM subscriptions WHERE chat_id = ?", (chat_id,)
+            ).fetchone()
+        return self.decode_pairs(row[0]) if row else []
+
+    def fetch_batch(self, after: Subscriber, limit: int) -> List[Subscriber]:
+        """Get the next subscribers ordered by (pairs, chat_id), so equal digests are contiguous"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT pairs, chat_id FROM subscriptions WHERE (pairs, chat_id) > (?, ?) "
+                "ORDER BY pairs, chat_id LIMIT ?",
+                (after[0], after[1], limit)
+            ).fetchall()
+
+    def get_checkpoint(self, run_id: str) -> Tuple[Subscriber, bool]:
+        """Get the last subscriber reached by a run and whether the run finished"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO digest_runs (run_id) VALUES (?)", (run_id,))
+            last_pairs, last_chat_id, finished = self._conn.execute(
+                "SELECT last_pairs, last_chat_id, finished FROM digest_runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return (last_pairs, last_chat_id), bool(finished)
+
+    def claim_run(self, run_id: str, owner: str, lease_seconds: float) -> bool:
+        """Atomically take an unfinished run unless another owner holds an unexpired lease"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO digest_runs (run_id) VALUES (?)", (run_id,))
+            cursor = self._conn.execute(
+                "UPDATE digest_runs SET owner = ?, lease_until = ? WHERE run_id = ? AND finished = 0 "
+                "AND (owner IS NULL OR owner = ? OR lease_until < ?)",
+                (owner, now + lease_seconds, run_id, owner, now)
+            )
+            return cursor.rowcount == 1
+
+    def save_checkpoint(self, run_id: str, last: Subscriber, owner: str, lease_seconds: float) -> bool:
+        """Record the last subscriber a run has reached and renew the lease, if still held by owner"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE digest_runs SET last_pairs = ?, last_chat_id = ?, lease_until = ? "
+                "WHERE run_id = ? AND owner = ?",
+                (last[0], last[1], time.time() + lease_seconds, run_id, owner)
+            )
+            return cursor.rowcount == 1
+
+    def release_run(self, run_id: str, owner: str) -> None:
+        """Give up a run's lease so another broadcast can continue it"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE digest_runs SET owner = NULL, lease_until = 0 WHERE run_id = ? AND owner = ?",
+                (run_id, owner)
+            )
+
+    def finish_run(self, run_id: str) -> None:
+        """Mark a run as complete and release its lease"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE digest_runs SET finished = 1, owner = NULL, lease_until = 0 WHERE run_id = ?",
+                (run_id,)
+            )
+
+    def get_unfinished_run(self) -> Optional[str]:
+        """Get the most recent run that was interrupted before finishing"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id FROM digest_runs WHERE finished = 0 ORDER BY run_id DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,120 @@
+"""
+Chart rendering utilities.
+This module contains a dependency-free PNG line chart renderer used by
+the /chart command. Functions here are module-level and pure so they can
+be shipped to a process pool without touching the event loop.
+"""
+
+import struct
+import zlib
+from typing import List, Sequence, Tuple
+
+Color = Tuple[int, int, int]
+
+BACKGROUND = (255, 255, 255)
+GRID = (232, 234, 237)
+UP_LINE = (30, 142, 62)
+UP_FILL = (214, 238, 220)
+DOWN_LINE = (217, 48, 37)
+DOWN_FILL = (250, 220, 217)
+
+PADDING = 16
+
+
+def render_line_chart(values: Sequence[float], width: int = 640, height: int = 320) -> bytes:
+    """Render a filled line chart of values and return it as PNG bytes"""
+    if len(values) < 2:
+        raise ValueError("At least two values are required to draw a chart")
+
+    rising = values[-1] >= values[0]
+    line_color = UP_LINE if rising else DOWN_LINE
+    fill_color = UP_FILL if rising else DOWN_FILL
+
+    pixels = [bytearray(BACKGROUND * width) for _ in range(height)]
+    _draw_grid(pixels, width, height)
+
+    points = _scale_points(values, width, height)
+    _fill_under(pixels, points, height, fill_color)
+    for start, end in zip(points, points[1:]):
+        _draw_line(pixels, start, end, width, height, line_color)
+
+    return _encode_png(pixels, width, height)
+
+
+def _scale_points(values: Sequence[float], width: int, height: int) -> List[Tuple[int, int]]:
+    """Map values onto pixel coordinates inside the padded plot area"""
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    plot_width = width - 2 * PADDING - 1
+    plot_height = height - 2 * PADDING - 1
+    last = len(values) - 1
+
+    points = []
+    for index, value in enumerate(values):
+        x = PADDING + round(index * plot_width / last)
+        y = PADDING + round((high - value) * plot_height / span)
+        points.append((x, y))
+    return points
+
+
+def _draw_grid(pixels: List[bytearray], width: int, height: int) -> None:
+    """Draw four evenly spaced horizontal grid lines"""
+    row = bytes(GRID * (width - 2 * PADDING))
+    for step in range(5):
+        y = PADDING + step * (height - 2 * PADDING - 1) // 4
+        pixels[y][PADDING * 3:(width - PADDING) * 3] = row
+
+
+def _fill_under(pixels: List[bytearray], points: List[Tuple[int, int]], height: int, color: Color) -> None:
+    """Shade the area between the line and the bottom of the plot"""
+    bottom = height - PADDING
+    pixel = bytes(color)
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        for x in range(x0, x1 + 1):
+            y = y0 + (y1 - y0) * (x - x0) // ((x1 - x0) or 1)
+            offset = x * 3
+            for row in range(y, bottom):
+                pixels[row][offset:offset + 3] = pixel
+
+
+def _draw_line(pixels: List[bytearray], start: Tuple[int, int], end: Tuple[int, int],
+               width: int, height: int, color: Color) -> None:
+    """Draw a two-pixel-thick line using Bresenham's algorithm"""
+    x0, y0 = start
+    x1, y1 = end
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx + dy
+    pixel = bytes(color)
+
+    while True:
+        for px, py in ((x0, y0), (x0 + 1, y0), (x0, y0 + 1), (x0 + 1, y0 + 1)):
+            if 0 <= px < width and 0 <= py < height:
+                pixels[py][px * 3:px * 3 + 3] = pixel
+        if x0 == x1 and y0 == y1:
+            break
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
+
+
+def _encode_png(pixels: List[bytearray], width: int, height: int) -> bytes:
+    """Encode RGB rows as a PNG image"""
+    raw = b"".join(b"\x00" + bytes(row) for row in pixels)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw, 6))
+        + chunk(b"IEND", b"")
+    )
@@ -4,6 +4,11 @@ This module contains the MessageFormatter class that handles
 consistent formatting of numbers, rates, and amounts throughout the bot.
 """
 
+import math
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict
+
 
 class MessageFormatter:
     """Class for formatting messages"""
@@ -13,8 +18,11 @@ class MessageFormatter:
         """Format exchange rate for display"""
         if rate >= 1:
             return f"{rate:,.2f}"
-        else:
+        elif rate >= 0.01 or rate <= 0:
             return f"{rate:.4f}"
+        else:
+            # Keep three significant digits for tiny cross rates such as KHR to GBP
+            return f"{rate:.{2 - math.floor(math.log10(rate))}f}"
     
     @staticmethod
     def format_amount(amount: float) -> str:
@@ -24,6 +32,11 @@ class MessageFormatter:
         else:
             return f"{amount:.4f}"
     
+    @staticmethod
+    def format_decimal_amount(amount: Decimal) -> str:
+        """Format an already rounded Decimal amount, keeping its exact places"""
+        return f"{amount:,f}"
+    
     @staticmethod
     def format_exchange_rate(rate: float) -> str:
         """Format exchange rate for conversion display"""
@@ -36,3 +49,12 @@ class MessageFormatter:
     def format_percentage(percentage: float) -> str:
         """Format percentage change"""
         return f"{percentage:+.2f}%"
+    
+    @staticmethod
+    def format_source(source: Dict) -> str:
+        """Format a rate's provider and the time its rates were valid"""
+        valid_at = datetime.fromtimestamp(source['timestamp'], timezone.utc)
+        # Daily datasets only publish a date; a time of day would be made up
+        if source.get('date_only'):
+            return f"{source['label']} ({valid_at.strftime('%Y-%m-%d')})"
+        return f"{source['label']} ({valid_at.strftime('%Y-%m-%d %H:%M')} UTC)"
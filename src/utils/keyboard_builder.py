@@ -1,12 +1,18 @@
 """Keyboard builder utility for creating inline keyboards"""
 
+from functools import lru_cache
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
+from ..data.currency_data import CurrencyData
+
 
 class KeyboardBuilder:
     """Class for building inline keyboards"""
     
+    # Keyboards are immutable telegram objects, so each one is built once and shared
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_main_menu_keyboard() -> InlineKeyboardMarkup:
         """Get the main menu keyboard"""
         keyboard = [
@@ -25,6 +31,20 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
     
     @staticmethod
+    @lru_cache(maxsize=None)
+    def get_rates_base_keyboard(current_base: str) -> InlineKeyboardMarkup:
+        """Get the base currency selector shown under the rates table"""
+        buttons = [
+            InlineKeyboardButton(f"• {code.upper()} •" if code == current_base else code.upper(),
+                                 callback_data=f"rates:{code}")
+            for code in CurrencyData.get_currencies()
+        ]
+        keyboard = [buttons[i:i + 5] for i in range(0, len(buttons), 5)]
+        keyboard.append([InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")])
+        return InlineKeyboardMarkup(keyboard)
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
     def get_back_to_menu_keyboard() -> InlineKeyboardMarkup:
         """Get back to main menu keyboard"""
         keyboard = [[InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]]
@@ -0,0 +1,260 @@
+"""
+Lightweight span tracing utilities.
+This module contains a minimal tracer for attributing update latency to
+stages (API fetches, message building, Telegram calls). Traces are
+sampled at the root; when a trace is not sampled every span call returns
+a shared no-op span, so instrumentation costs almost nothing.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ('tracer', 'name', 'trace_id', 'span_id', 'parent_id',
+                 'start_ns', 'end_ns', 'attributes', 'status', '_token', '_start_perf_ns')
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = 'ok'
+        self.start_ns = 0
+        self.end_ns = 0
+        self._start_perf_ns = 0
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        self._start_perf_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # The wall clock only dates the span; its duration comes from the monotonic clock
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._start_perf_ns)
+        if exc_type is not None:
+            self.status = 'error'
+            self.attributes['error'] = exc_type.__name__
+        _current_span.reset(self._token)
+        self.tracer.export(self)
+
+    def set_attribute(self, key: str, value) -> None:
+        """Attach an attribute to the span"""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict:
+        """Serialize the span for export"""
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_ns': self.start_ns,
+            'duration_ms': (self.end_ns - self.start_ns) / 1e6,
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+
+class _NoopSpan:
+    """Span returned when the current trace is not sampled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set_attribute(self, key: str, value) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(ABC):
+    """Base exporter that hands finished spans to a background thread in batches"""
+
+    BATCH_SIZE = 256
+
+    def __init__(self):
+        self._queue: "queue.SimpleQueue[Optional[Span]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        """Queue a finished span without blocking the caller"""
+        self._queue.put(span)
+
+    def shutdown(self) -> None:
+        """Flush queued spans and stop the background thread"""
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    @abstractmethod
+    def write(self, spans: List[Span]) -> None:
+        """Write a batch of spans"""
+
+    def _run(self) -> None:
+        """Write whatever spans are queued, up to BATCH_SIZE at a time"""
+        while True:
+            span = self._queue.get()
+            batch: List[Span] = []
+            while span is not None:
+                batch.append(span)
+                if len(batch) >= self.BATCH_SIZE:
+                    break
+                try:
+                    span = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self.write(batch)
+                except Exception as e:
+                    logger.warning(f"Dropping {len(batch)} spans: {e}")
+            if span is None:
+                return
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Exporter appending one JSON object per span to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        super().__init__()
+
+    def write(self, spans: List[Span]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+
+
+class OtlpSpanExporter(SpanExporter):
+    """Exporter posting spans as OTLP/HTTP JSON to a collector endpoint"""
+
+    def __init__(self, endpoint: str, service_name: str = "xchange-bot"):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        super().__init__()
+
+    def write(self, spans: List[Span]) -> None:
+        import requests
+
+        payload = {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', self.service_name)]},
+                'scopeSpans': [{
+                    'scope': {'name': self.service_name},
+                    'spans': [self._to_otlp(span) for span in spans]
+                }]
+            }]
+        }
+        response = requests.post(self.endpoint, json=payload, timeout=5)
+        if response.status_code >= 300:
+            logger.warning(f"Trace collector returned status code: {response.status_code}")
+
+    @staticmethod
+    def _to_otlp(span: Span) -> Dict:
+        """Convert a span to the OTLP JSON encoding"""
+        otlp_span = {
+            'traceId': span.trace_id,
+            'spanId': span.span_id,
+            'name': span.name,
+            'kind': 1,
+            'startTimeUnixNano': str(span.start_ns),
+            'endTimeUnixNano': str(span.end_ns),
+            'attributes': [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+            'status': {'code': 2 if span.status == 'error' else 1}
+        }
+        if span.parent_id:
+            otlp_span['parentSpanId'] = span.parent_id
+        return otlp_span
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    """Encode an attribute as an OTLP key/value"""
+    if isinstance(value, bool):
+        encoded = {'boolValue': value}
+    elif isinstance(value, int):
+        encoded = {'intValue': str(value)}
+    elif isinstance(value, float):
+        encoded = {'doubleValue': value}
+    else:
+        encoded = {'stringValue': str(value)}
+    return {'key': key, 'value': encoded}
+
+
+class Tracer:
+    """Class for starting sampled traces and nested spans"""
+
+    def __init__(self):
+        self.sample_rate = 0.0
+        self.exporter: Optional[SpanExporter] = None
+
+    def configure(self, exporter: Optional[SpanExporter], sample_rate: float) -> None:
+        """Set where spans go and what fraction of traces are recorded"""
+        self.exporter = exporter
+        self.sample_rate = sample_rate if exporter else 0.0
+
+    def configure_from_spec(self, spec: Optional[str], sample_rate: float) -> None:
+        """Configure from a spec such as 'jsonl:traces.jsonl' or 'otlp:http://localhost:4318/v1/traces'"""
+        if not spec or sample_rate <= 0:
+            self.configure(None, 0.0)
+            return
+
+        kind, _, target = spec.partition(':')
+        if kind == 'jsonl':
+            exporter = JsonlSpanExporter(target or "traces.jsonl")
+        elif kind == 'otlp':
+            exporter = OtlpSpanExporter(target or "http://localhost:4318/v1/traces")
+        else:
+            raise ValueError(f"Unknown trace exporter: {kind}")
+        self.configure(exporter, sample_rate)
+        logger.info(f"Tracing {sample_rate:.0%} of updates to {spec}")
+
+    def start_trace(self, name: str, **attributes) -> "Span | _NoopSpan":
+        """Start a root span, subject to sampling"""
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return NOOP_SPAN
+        return Span(self, name, f"{random.getrandbits(128):032x}", None, attributes)
+
+    def span(self, name: str, **attributes) -> "Span | _NoopSpan":
+        """Start a child of the current span, or a no-op when nothing is being traced"""
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+    def export(self, span: Span) -> None:
+        """Hand a finished span to the exporter"""
+        if self.exporter:
+            self.exporter.export(span)
+
+    def shutdown(self) -> None:
+        """Flush and stop the exporter"""
+        if self.exporter:
+            self.exporter.shutdown()
+            self.exporter = None
+            self.sample_rate = 0.0
+
+
+tracer = Tracer()